@@ -1,5 +1,21 @@
+import os
+import threading
+import time
+
 import pandas as pd
 from backend.ingestion import get_connection
+from backend.roles import role_job_filter
+from backend.streaming import query_dataframe, copy_query_to_csv
+
+# Dashboard snapshot cache: served from memory for DASHBOARD_TTL_SECONDS, after which
+# one cheap read of dashboard_change_seq decides whether the snapshot is rebuilt.
+# A snapshot is only cached if the sequence didn't move while it was built, and is
+# rebuilt unconditionally after DASHBOARD_MAX_AGE_SECONDS.
+DASHBOARD_TTL_SECONDS = float(os.getenv("DASHBOARD_TTL_SECONDS", "5"))
+DASHBOARD_MAX_AGE_SECONDS = float(os.getenv("DASHBOARD_MAX_AGE_SECONDS", "300"))
+
+_snapshot_lock = threading.Lock()
+_snapshot_cache = {"snapshot": None, "change_seq": None, "checked_at": 0.0, "built_at": 0.0}
 
 
 def get_global_ats_stats():
@@ -21,14 +37,15 @@ def get_global_ats_stats():
         job_row = cursor.fetchone()
         total_jobs, open_jobs, closed_jobs = job_row
 
-        # Applications + ATS stats
+        # Applications + ATS stats (from the trigger-maintained summary, see backend/schema.py)
         cursor.execute(
             """
             SELECT
-                COUNT(*) AS total_applications,
-                AVG(ats_score) AS avg_ats_score_overall,
-                AVG(ats_score) FILTER (WHERE status IN ('screened', 'shortlisted')) AS avg_ats_score_screened
-            FROM applications;
+                COALESCE(SUM(app_count), 0)::bigint AS total_applications,
+                SUM(score_sum) / NULLIF(SUM(scored_count), 0) AS avg_ats_score_overall,
+                SUM(score_sum) FILTER (WHERE status IN ('screened', 'shortlisted'))
+                    / NULLIF(SUM(scored_count) FILTER (WHERE status IN ('screened', 'shortlisted')), 0) AS avg_ats_score_screened
+            FROM application_summary;
             """
         )
         app_row = cursor.fetchone()
@@ -50,58 +67,76 @@ def get_global_ats_stats():
 
 def get_applications_by_status():
     
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute(
-            """
+    columns = ["status", "count"]
+
+    return query_dataframe(
+        """
+        SELECT
+            status,
+            SUM(app_count)::bigint AS count
+        FROM application_summary
+        GROUP BY status
+        HAVING SUM(app_count) > 0
+        ORDER BY count DESC;
+        """,
+        (),
+        columns,
+    )
+
+
+def get_status_funnel(job_post_id=None):
+    # Transitions between statuses and the average time spent in the stage being left,
+    # from the trigger-maintained application_funnel_summary (no history scan)
+    scope_sql, scope_params = ("job_post_id = %s", [job_post_id]) if job_post_id is not None else ("TRUE", [])
+    columns = ["from_status", "to_status", "transitions", "avg_hours_in_from_status"]
+
+    return query_dataframe(
+        f"""
+        SELECT
+            from_status,
+            to_status,
+            SUM(transitions)::bigint AS transitions,
+            SUM(total_seconds) / NULLIF(SUM(timed_transitions), 0) / 3600.0 AS avg_hours_in_from_status
+        FROM application_funnel_summary
+        WHERE {scope_sql}
+        GROUP BY from_status, to_status
+        ORDER BY transitions DESC;
+        """,
+        tuple(scope_params),
+        columns,
+    )
+
+
+def get_stage_conversion(job_post_id=None):
+    # Applications entering each status, as a share of created applications
+    scope_sql, scope_params = ("job_post_id = %s", [job_post_id]) if job_post_id is not None else ("TRUE", [])
+    columns = ["status", "entered", "conversion_rate"]
+
+    return query_dataframe(
+        f"""
+        WITH entered AS (
             SELECT
-                status,
-                COUNT(*) AS count
-            FROM applications
-            GROUP BY status
-            ORDER BY count DESC;
-            """
+                to_status AS status,
+                SUM(transitions) FILTER (WHERE from_status <> to_status) AS entered,
+                SUM(transitions) FILTER (WHERE from_status = 'created') AS created
+            FROM application_funnel_summary
+            WHERE {scope_sql}
+            GROUP BY to_status
         )
-        rows = cursor.fetchall()
-
-    finally:
-        cursor.close()
-        conn.close()
-
-    if not rows:
-        return pd.DataFrame(columns=["status", "count"])
-
-    return pd.DataFrame(rows, columns=["status", "count"])
+        SELECT
+            status,
+            COALESCE(entered, 0)::bigint AS entered,
+            COALESCE(entered, 0)::float / NULLIF(SUM(created) OVER (), 0) AS conversion_rate
+        FROM entered
+        ORDER BY entered DESC;
+        """,
+        tuple(scope_params),
+        columns,
+    )
 
 
 def get_department_stats():
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute(
-            """
-            SELECT
-                jp.department,
-                COUNT(DISTINCT jp.id) AS total_jobs,
-                COUNT(DISTINCT jp.id) FILTER (WHERE jp.status = 'open') AS open_jobs,
-                COUNT(a.id) AS total_applications,
-                AVG(a.ats_score) AS avg_ats_score
-            FROM job_posts jp
-            LEFT JOIN applications a ON a.job_post_id = jp.id
-            GROUP BY jp.department
-            ORDER BY total_applications DESC;
-            """
-        )
-        rows = cursor.fetchall()
-
-    finally:
-        cursor.close()
-        conn.close()
-
     columns = [
         "department",
         "total_jobs",
@@ -110,40 +145,31 @@ def get_department_stats():
         "avg_ats_score",
     ]
 
-    if not rows:
-        return pd.DataFrame(columns=columns)
-
-    df = pd.DataFrame(rows, columns=columns)
-    return df
+    return query_dataframe(
+        """
+        WITH per_job AS (
+            SELECT job_post_id, SUM(app_count) AS app_count, SUM(scored_count) AS scored_count, SUM(score_sum) AS score_sum
+            FROM application_summary
+            GROUP BY job_post_id
+        )
+        SELECT
+            jp.department,
+            COUNT(*) AS total_jobs,
+            COUNT(*) FILTER (WHERE jp.status = 'open') AS open_jobs,
+            COALESCE(SUM(pj.app_count), 0)::bigint AS total_applications,
+            SUM(pj.score_sum) / NULLIF(SUM(pj.scored_count), 0) AS avg_ats_score
+        FROM job_posts jp
+        LEFT JOIN per_job pj ON pj.job_post_id = jp.id
+        GROUP BY jp.department
+        ORDER BY total_applications DESC;
+        """,
+        (),
+        columns,
+    )
 
 
 def get_job_level_stats():
     
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute(
-            """
-            SELECT
-                jp.id AS job_post_id,
-                jp.role_title,
-                jp.department,
-                jp.status,
-                COUNT(a.id) AS total_applications,
-                AVG(a.ats_score) AS avg_ats_score
-            FROM job_posts jp
-            LEFT JOIN applications a ON a.job_post_id = jp.id
-            GROUP BY jp.id, jp.role_title, jp.department, jp.status
-            ORDER BY jp.created_at DESC;
-            """
-        )
-        rows = cursor.fetchall()
-
-    finally:
-        cursor.close()
-        conn.close()
-
     columns = [
         "job_post_id",
         "role_title",
@@ -153,33 +179,106 @@ def get_job_level_stats():
         "avg_ats_score",
     ]
 
-    if not rows:
-        return pd.DataFrame(columns=columns)
-
-    df = pd.DataFrame(rows, columns=columns)
-    return df
+    return query_dataframe(
+        """
+        WITH per_job AS (
+            SELECT job_post_id, SUM(app_count) AS app_count, SUM(scored_count) AS scored_count, SUM(score_sum) AS score_sum
+            FROM application_summary
+            GROUP BY job_post_id
+        )
+        SELECT
+            jp.id AS job_post_id,
+            jp.role_title,
+            jp.department,
+            jp.status,
+            COALESCE(pj.app_count, 0)::bigint AS total_applications,
+            pj.score_sum / NULLIF(pj.scored_count, 0) AS avg_ats_score
+        FROM job_posts jp
+        LEFT JOIN per_job pj ON pj.job_post_id = jp.id
+        ORDER BY jp.created_at DESC;
+        """,
+        (),
+        columns,
+    )
 
 
 def get_applications_for_job(job_post_id):
+    columns = [
+        "application_id",
+        "resume_document_id",
+        "resume_name",
+        "status",
+        "ats_score",
+        "created_at",
+    ]
+
+    return query_dataframe(
+        """
+        SELECT
+            a.id,
+            a.resume_document_id,
+            d.title AS resume_name,
+            a.status,
+            a.ats_score,
+            a.created_at
+        FROM applications a
+        JOIN documents d ON a.resume_document_id = d.id
+        WHERE a.job_post_id = %s
+        ORDER BY a.ats_score DESC NULLS LAST, a.created_at ASC;
+        """,
+        (job_post_id,),
+        columns,
+        parse_dates=["created_at"],
+    )
+
+
+def get_applications_page(
+    job_post_id,
+    page_size=50,
+    after=None,
+    min_score=None,
+    max_score=None,
+    statuses=None,
+):
+    # One page of a job's candidates ordered by ATS score (unscored last), then created_at, id.
+    # `after` is the cursor returned for the previous page; returns (DataFrame, next_cursor or None).
+    conditions = ["a.job_post_id = %s"]
+    params = [job_post_id]
+
+    if after is not None:
+        conditions.append("(-COALESCE(a.ats_score, -1), a.created_at, a.id) > (%s, %s, %s)")
+        params.extend(after)
+    if min_score is not None:
+        conditions.append("a.ats_score >= %s")
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append("a.ats_score <= %s")
+        params.append(max_score)
+    if statuses:
+        conditions.append("a.status = ANY(%s)")
+        params.append(list(statuses))
+
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute(
-            """
+            f"""
             SELECT
                 a.id,
                 a.resume_document_id,
                 d.title AS resume_name,
                 a.status,
                 a.ats_score,
-                a.created_at
+                a.created_at,
+                -COALESCE(a.ats_score, -1) AS score_rank
             FROM applications a
             JOIN documents d ON a.resume_document_id = d.id
-            WHERE a.job_post_id = %s
-            ORDER BY a.ats_score DESC NULLS LAST, a.created_at ASC;
+            WHERE {" AND ".join(conditions)}
+            ORDER BY -COALESCE(a.ats_score, -1), a.created_at, a.id
+            LIMIT %s;
             """,
-            (job_post_id,),
+            (*params, page_size + 1),
         )
         rows = cursor.fetchall()
 
@@ -196,20 +295,26 @@ def get_applications_for_job(job_post_id):
         "created_at",
     ]
 
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = (last[6], last[5], last[0])
+
     if not rows:
-        return pd.DataFrame(columns=columns)
+        return pd.DataFrame(columns=columns), None
 
-    df = pd.DataFrame(rows, columns=columns)
-    return df
+    return pd.DataFrame([r[:6] for r in rows], columns=columns), next_cursor
 
 
-def get_role_stats(role_pattern):
+def get_role_stats(role_pattern=None, role_family_id=None):
+    role_sql, role_params = role_job_filter(role_pattern, role_family_id)
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute(
-            """
+            f"""
             SELECT
                 COUNT(a.id) AS total_applications,
                 AVG(a.ats_score) AS avg_score,
@@ -218,10 +323,10 @@ def get_role_stats(role_pattern):
                 percentile_cont(0.5) WITHIN GROUP (ORDER BY a.ats_score) AS median_score
             FROM job_posts jp
             JOIN applications a ON a.job_post_id = jp.id
-            WHERE jp.role_title ILIKE %s
+            WHERE {role_sql}
               AND a.ats_score IS NOT NULL;
             """,
-            (role_pattern,),
+            tuple(role_params),
         )
         row = cursor.fetchone()
 
@@ -248,22 +353,69 @@ def get_role_stats(role_pattern):
         cursor.close()
         conn.close()
         
-def get_role_score(role_pattern):
+def export_applications_csv(out, job_post_id=None):
+    # Scored applications as CSV, streamed via COPY so memory stays bounded
+    scope_sql, scope_params = ("a.job_post_id = %s", [job_post_id]) if job_post_id is not None else ("TRUE", [])
+    copy_query_to_csv(
+        f"""
+        SELECT
+            a.id AS application_id,
+            a.job_post_id,
+            jp.role_title,
+            jp.department,
+            a.resume_document_id,
+            d.title AS resume_name,
+            a.status,
+            a.ats_score,
+            a.missing_skills,
+            a.created_at
+        FROM applications a
+        JOIN job_posts jp ON jp.id = a.job_post_id
+        JOIN documents d ON d.id = a.resume_document_id
+        WHERE {scope_sql}
+          AND a.ats_score IS NOT NULL
+        ORDER BY a.job_post_id, -a.ats_score, a.created_at, a.id
+        """,
+        scope_params,
+        out,
+    )
+
+def _score_scope(job_post_id=None, role_pattern=None, role_family_id=None):
+    # WHERE condition on applications "a" joined to job_posts "jp"
+    if job_post_id is not None:
+        return "a.job_post_id = %s", [job_post_id]
+    return role_job_filter(role_pattern, role_family_id)
+
+
+def _bin_label(i, bins):
+    # Same float edges as width_bucket: [low, high), the last bin closed at 100
+    low, high = 100 * i / bins, 100 * (i + 1) / bins
+    return f"[{low:.4g}, {high:.4g}]" if i == bins - 1 else f"[{low:.4g}, {high:.4g})"
+
+
+def get_score_histogram(job_post_id=None, role_pattern=None, role_family_id=None, bins=10):
+    # Fixed-width ATS score bins over [0, 100] computed in SQL; the payload is O(bins).
+    # Bin i holds [100*i/bins, 100*(i+1)/bins) with 100 folded into the last bin, like pd.cut(right=False).
+    scope_sql, scope_params = _score_scope(job_post_id, role_pattern, role_family_id)
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute(
-            """
-            SELECT
-                a.ats_score
-            FROM applications a
-            JOIN job_posts jp ON jp.id = a.job_post_id
-            WHERE jp.role_title ILIKE %s
-              AND a.ats_score IS NOT NULL
-            ORDER BY a.ats_score;
+            f"""
+            SELECT b.bin, COALESCE(c.count, 0) AS count
+            FROM generate_series(1, %s) AS b(bin)
+            LEFT JOIN (
+                SELECT LEAST(width_bucket(a.ats_score, 0, 100, %s), %s) AS bin, COUNT(*) AS count
+                FROM applications a
+                JOIN job_posts jp ON jp.id = a.job_post_id
+                WHERE {scope_sql}
+                  AND a.ats_score IS NOT NULL
+                GROUP BY 1
+            ) c ON c.bin = b.bin
+            ORDER BY b.bin;
             """,
-            (role_pattern,),
+            (bins, bins, bins, *scope_params),
         )
         rows = cursor.fetchall()
 
@@ -271,83 +423,84 @@ def get_role_score(role_pattern):
         cursor.close()
         conn.close()
 
-    if not rows:
-        return pd.DataFrame(columns=["ats_score"])
+    return pd.DataFrame(
+        [(_bin_label(bin_no - 1, bins), count) for bin_no, count in rows],
+        columns=["bin", "count"],
+    )
 
-    scores = [r[0] for r in rows]
-    df = pd.DataFrame({"ats_score": scores})
-    return df
 
-def get_missing_skills(role_pattern, limit=20):
+def get_score_quantiles(job_post_id=None, role_pattern=None, role_family_id=None, quantiles=(0.25, 0.5, 0.75, 0.9)):
+    scope_sql, scope_params = _score_scope(job_post_id, role_pattern, role_family_id)
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute(
-            """
-            SELECT
-                LOWER(TRIM(skill)) AS skill,
-                COUNT(*) AS missing_count
+            f"""
+            SELECT percentile_cont(%s::float8[]) WITHIN GROUP (ORDER BY a.ats_score)
             FROM applications a
             JOIN job_posts jp ON jp.id = a.job_post_id
-            CROSS JOIN LATERAL jsonb_array_elements_text(a.missing_skills) AS skill
-            WHERE jp.role_title ILIKE %s
-              AND a.missing_skills IS NOT NULL
-            GROUP BY LOWER(TRIM(skill))
-            ORDER BY missing_count DESC
-            LIMIT %s;
+            WHERE {scope_sql}
+              AND a.ats_score IS NOT NULL;
             """,
-            (role_pattern, limit),
+            (list(quantiles), *scope_params),
         )
-        rows = cursor.fetchall()
+        values = cursor.fetchone()[0]
 
     finally:
         cursor.close()
         conn.close()
 
-    columns = ["skill", "missing_count"]
+    if values is None:
+        return {q: None for q in quantiles}
+    return {q: float(v) if v is not None else None for q, v in zip(quantiles, values)}
 
-    if not rows:
-        return pd.DataFrame(columns=columns)
-
-    df = pd.DataFrame(rows, columns=columns)
-    return df
 
+def get_missing_skills(role_pattern=None, limit=20, role_family_id=None):
+    role_sql, role_params = role_job_filter(role_pattern, role_family_id)
+    columns = ["skill", "missing_count"]
 
-def get_missing_skills_for_job(job_post_id, limit=20):
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    try:
-        cursor.execute(
-            """
-            SELECT
-                LOWER(TRIM(skill)) AS skill,
-                COUNT(*) AS missing_count
-            FROM applications a
-            CROSS JOIN LATERAL jsonb_array_elements_text(a.missing_skills) AS skill
-            WHERE a.job_post_id = %s
-              AND a.missing_skills IS NOT NULL
-            GROUP BY LOWER(TRIM(skill))
-            ORDER BY missing_count DESC
-            LIMIT %s;
-            """,
-            (job_post_id, limit),
-        )
-        rows = cursor.fetchall()
+    return query_dataframe(
+        f"""
+        SELECT
+            s.name AS skill,
+            COUNT(*) AS missing_count
+        FROM application_skills aps
+        JOIN skills s ON s.id = aps.skill_id
+        WHERE aps.job_post_id IN (SELECT jp.id FROM job_posts jp WHERE {role_sql})
+          AND aps.kind = 'missing_must'
+        GROUP BY s.name
+        ORDER BY missing_count DESC
+        LIMIT %s;
+        """,
+        (*role_params, limit),
+        columns,
+    )
 
-    finally:
-        cursor.close()
-        conn.close()
 
+def get_missing_skills_for_job(job_post_id, limit=20):
     columns = ["skill", "missing_count"]
 
-    if not rows:
-        return pd.DataFrame(columns=columns)
-
-    df = pd.DataFrame(rows, columns=columns)
-    df = pd.DataFrame(rows, columns=columns)
-    return df
+    return query_dataframe(
+        """
+        SELECT
+            s.name AS skill,
+            top.missing_count
+        FROM (
+            SELECT skill_id, COUNT(*) AS missing_count
+            FROM application_skills
+            WHERE job_post_id = %s
+              AND kind = 'missing_must'
+            GROUP BY skill_id
+            ORDER BY missing_count DESC
+            LIMIT %s
+        ) top
+        JOIN skills s ON s.id = top.skill_id
+        ORDER BY top.missing_count DESC;
+        """,
+        (job_post_id, limit),
+        columns,
+    )
 
 
 def get_application_details(application_id):
@@ -355,6 +508,7 @@ def get_application_details(application_id):
     cursor = conn.cursor()
 
     try:
+        # Project only the JSON paths the detail view renders
         cursor.execute(
             """
             SELECT
@@ -362,7 +516,8 @@ def get_application_details(application_id):
                 a.resume_document_id,
                 d.title AS resume_name,
                 a.ats_score,
-                a.metadata,
+                a.metadata->'score_breakdown'->'score_details' AS score_details,
+                a.metadata->'score_breakdown'->'explanation' AS explanation,
                 a.created_at
             FROM applications a
             JOIN documents d ON a.resume_document_id = d.id
@@ -375,20 +530,228 @@ def get_application_details(application_id):
         if not row:
             return None
 
-        app_id, doc_id, resume_name, score, metadata, created_at = row
-        
-        # Extract score_breakdown from metadata
-        metadata = metadata if isinstance(metadata, dict) else (metadata if metadata else {})
-        breakdown = metadata.get("score_breakdown", {})
+        app_id, doc_id, resume_name, score, score_details, explanation, created_at = row
 
         return {
             "application_id": app_id,
             "resume_name": resume_name,
             "ats_score": float(score) if score is not None else 0.0,
-            "score_breakdown": breakdown,
+            "score_breakdown": {
+                "score_details": score_details or {},
+                "explanation": explanation or {},
+            },
             "created_at": created_at
         }
 
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
+
+
+def check_application_summary(repair=False):
+    # Compares application_summary with live aggregates over applications.
+    # Returns the mismatching (job_post_id, status) keys; repair=True rebuilds the table.
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        if repair:
+            # Block writers so no trigger delta lands between the rebuild's read and write
+            cursor.execute("LOCK TABLE applications IN SHARE MODE")
+
+        cursor.execute(
+            """
+            WITH live AS (
+                SELECT
+                    job_post_id,
+                    COALESCE(status, 'unknown') AS status,
+                    COUNT(*) AS app_count,
+                    COUNT(ats_score) AS scored_count,
+                    COALESCE(SUM(ats_score), 0) AS score_sum
+                FROM applications
+                GROUP BY 1, 2
+            )
+            SELECT
+                COALESCE(l.job_post_id, s.job_post_id) AS job_post_id,
+                COALESCE(l.status, s.status) AS status,
+                COALESCE(l.app_count, 0) AS live_app_count,
+                COALESCE(s.app_count, 0) AS summary_app_count,
+                COALESCE(l.scored_count, 0) AS live_scored_count,
+                COALESCE(s.scored_count, 0) AS summary_scored_count,
+                COALESCE(l.score_sum, 0) AS live_score_sum,
+                COALESCE(s.score_sum, 0) AS summary_score_sum
+            FROM live l
+            FULL OUTER JOIN application_summary s
+              ON s.job_post_id = l.job_post_id AND s.status = l.status
+            WHERE COALESCE(l.app_count, 0) <> COALESCE(s.app_count, 0)
+               OR COALESCE(l.scored_count, 0) <> COALESCE(s.scored_count, 0)
+               OR COALESCE(l.score_sum, 0) <> COALESCE(s.score_sum, 0);
+            """
+        )
+        rows = cursor.fetchall()
+
+        if repair and rows:
+            cursor.execute("DELETE FROM application_summary")
+            cursor.execute(
+                """
+                INSERT INTO application_summary (job_post_id, status, app_count, scored_count, score_sum)
+                SELECT job_post_id, COALESCE(status, 'unknown'), COUNT(*), COUNT(ats_score), COALESCE(SUM(ats_score), 0)
+                FROM applications
+                GROUP BY 1, 2;
+                """
+            )
+        conn.commit()
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+    columns = [
+        "job_post_id",
+        "status",
+        "live_app_count",
+        "summary_app_count",
+        "live_scored_count",
+        "summary_scored_count",
+        "live_score_sum",
+        "summary_score_sum",
+    ]
+
+    if not rows:
+        return pd.DataFrame(columns=columns)
+
+    return pd.DataFrame(rows, columns=columns)
+
+
+DASHBOARD_SNAPSHOT_SQL = """
+    WITH per_job AS (
+        SELECT job_post_id, SUM(app_count) AS app_count, SUM(scored_count) AS scored_count, SUM(score_sum) AS score_sum
+        FROM application_summary
+        GROUP BY job_post_id
+    )
+    SELECT json_build_object(
+        'change_seq', (SELECT last_value FROM dashboard_change_seq),
+        'jobs', (
+            SELECT json_build_object(
+                'total_jobs', COUNT(*),
+                'open_jobs', COUNT(*) FILTER (WHERE status = 'open'),
+                'closed_jobs', COUNT(*) FILTER (WHERE status = 'closed')
+            )
+            FROM job_posts
+        ),
+        'applications', (
+            SELECT json_build_object(
+                'total_applications', COALESCE(SUM(app_count), 0),
+                'avg_ats_score_overall', SUM(score_sum) / NULLIF(SUM(scored_count), 0),
+                'avg_ats_score_screened', SUM(score_sum) FILTER (WHERE status IN ('screened', 'shortlisted'))
+                    / NULLIF(SUM(scored_count) FILTER (WHERE status IN ('screened', 'shortlisted')), 0)
+            )
+            FROM application_summary
+        ),
+        'by_status', (
+            SELECT COALESCE(json_agg(json_build_array(status, count) ORDER BY count DESC), '[]'::json)
+            FROM (
+                SELECT status, SUM(app_count) AS count
+                FROM application_summary
+                GROUP BY status
+                HAVING SUM(app_count) > 0
+            ) s
+        ),
+        'departments', (
+            SELECT COALESCE(json_agg(json_build_array(department, total_jobs, open_jobs, total_applications, avg_ats_score)
+                                     ORDER BY total_applications DESC), '[]'::json)
+            FROM (
+                SELECT
+                    jp.department,
+                    COUNT(*) AS total_jobs,
+                    COUNT(*) FILTER (WHERE jp.status = 'open') AS open_jobs,
+                    COALESCE(SUM(pj.app_count), 0) AS total_applications,
+                    SUM(pj.score_sum) / NULLIF(SUM(pj.scored_count), 0) AS avg_ats_score
+                FROM job_posts jp
+                LEFT JOIN per_job pj ON pj.job_post_id = jp.id
+                GROUP BY jp.department
+            ) d
+        ),
+        'job_level', (
+            SELECT COALESCE(json_agg(json_build_array(
+                       jp.id, jp.role_title, jp.department, jp.status,
+                       COALESCE(pj.app_count, 0), pj.score_sum / NULLIF(pj.scored_count, 0)
+                   ) ORDER BY jp.created_at DESC), '[]'::json)
+            FROM job_posts jp
+            LEFT JOIN per_job pj ON pj.job_post_id = jp.id
+        )
+    );
+"""
+
+
+def _build_dashboard_snapshot(payload):
+    jobs = payload["jobs"]
+    apps = payload["applications"]
+    avg_overall = apps["avg_ats_score_overall"]
+    avg_screened = apps["avg_ats_score_screened"]
+
+    return {
+        "stats": {
+            "total_jobs": jobs["total_jobs"] or 0,
+            "open_jobs": jobs["open_jobs"] or 0,
+            "closed_jobs": jobs["closed_jobs"] or 0,
+            "total_applications": int(apps["total_applications"] or 0),
+            "avg_ats_score_overall": float(avg_overall) if avg_overall is not None else None,
+            "avg_ats_score_screened": float(avg_screened) if avg_screened is not None else None,
+        },
+        "by_status": pd.DataFrame(payload["by_status"], columns=["status", "count"]),
+        "departments": pd.DataFrame(
+            payload["departments"],
+            columns=["department", "total_jobs", "open_jobs", "total_applications", "avg_ats_score"],
+        ),
+        "job_level": pd.DataFrame(
+            payload["job_level"],
+            columns=["job_post_id", "role_title", "department", "status", "total_applications", "avg_ats_score"],
+        ),
+    }
+
+
+def get_dashboard_snapshot(force_refresh=False):
+    # Every overview dataset of the analytics page from one query / one connection.
+    # Returns {"stats": dict, "by_status": df, "departments": df, "job_level": df, "change_seq": int}.
+    with _snapshot_lock:
+        now = time.monotonic()
+        cached = _snapshot_cache["snapshot"]
+        if cached is not None and not force_refresh and now - _snapshot_cache["checked_at"] < DASHBOARD_TTL_SECONDS:
+            return cached
+
+        if cached is not None and now - _snapshot_cache["built_at"] >= DASHBOARD_MAX_AGE_SECONDS:
+            force_refresh = True
+
+        conn = get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT last_value FROM dashboard_change_seq;")
+            seq_before = cursor.fetchone()[0]
+            if cached is not None and not force_refresh and seq_before == _snapshot_cache["change_seq"]:
+                _snapshot_cache["checked_at"] = now
+                return cached
+
+            cursor.execute(DASHBOARD_SNAPSHOT_SQL)
+            payload = cursor.fetchone()[0]
+            cursor.execute("SELECT last_value FROM dashboard_change_seq;")
+            seq_after = cursor.fetchone()[0]
+
+        finally:
+            cursor.close()
+            conn.close()
+
+        snapshot = _build_dashboard_snapshot(payload)
+        snapshot["change_seq"] = payload["change_seq"]
+        if seq_after == seq_before:
+            _snapshot_cache.update(snapshot=snapshot, change_seq=seq_before, checked_at=now, built_at=now)
+        else:
+            # A write committed mid-build; serve this one but rebuild on the next call
+            _snapshot_cache.update(snapshot=None, change_seq=None)
+        return snapshot
+
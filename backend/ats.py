@@ -1,30 +1,27 @@
 from typing import Optional, Tuple
 
 from psycopg2.extras import Json
-from backend.ingestion import get_connection, insert_document, insert_sections, clean_text
-from backend.retrieval import extract_jd_requirements, extract_resume_entities, get_connection
-from backend.ingestion import read_pdf_text, clean_text
+from backend.ingestion import get_connection
+from backend.retrieval import JD_EXTRACTOR_VERSION, parse_llm_json
+from backend.create_job_post import ensure_jd_requirements
 import json
-import os
 from backend.llm import generate_answer
 
-import re
-from backend.retrieval import SKILLS_LIST
+from backend.skills import extract_skills_from_text_list, SKILLS_VERSION
+from backend.ats_batch import (
+    SCORING_VERSION,
+    load_resume_entities,
+    requirements_hash,
+    refresh_requirement_skills,
+    register_vocabulary,
+    write_application_skills,
+)
 
 def calculate_ats_score(resume_data: dict, jd_data: dict) -> dict:
+    # Keep backend.ats_batch._final_scores in sync and bump SCORING_VERSION when this formula changes
 
     resume_skills = set(resume_data.get("skills", []))
     
-    # Helper to extract standard skills from verbose JD text lists
-    def extract_skills_from_text_list(text_list):
-        found = set()
-        combined_text = " ".join(str(x) for x in text_list).lower()
-        for skill in SKILLS_LIST:
-            pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(pattern, combined_text):
-                found.add(skill)
-        return found
-    
     must_have_raw = jd_data.get("must_have", [])
     must_have_skills = extract_skills_from_text_list(must_have_raw)
     
@@ -69,7 +66,8 @@ def calculate_ats_score(resume_data: dict, jd_data: dict) -> dict:
         "missing_nice": list(missing_nice)
     }
 
-def generate_ats_explanation(score_data: dict, resume_text: str, jd_text: str) -> dict:
+def request_ats_explanation(score_data: dict, bypass_cache: bool = False) -> dict:
+    # Raises on LLM/parse errors so bulk generation can leave the row pending for a retry
     system_prompt = (
         "You are an expert ATS auditor. Explain the deterministic scoring results to a hiring manager."
         "Focus on GAPS and STRENGTHS. Be concise."
@@ -81,11 +79,21 @@ def generate_ats_explanation(score_data: dict, resume_text: str, jd_text: str) -
         "Draft a reasoning summary explaining why they got this score, and what they can do to improve."
     )
     
+    def is_explanation(data) -> bool:
+        return isinstance(data, dict) and isinstance(data.get("reasoning"), str)
+
+    response = generate_answer(
+        system_prompt, user_prompt, hedge=True, cache=True, bypass_cache=bypass_cache,
+        validate=lambda r: is_explanation(parse_llm_json(r)),
+    )
+    data = parse_llm_json(response)
+    if not is_explanation(data):
+        raise ValueError("Explanation JSON is missing 'reasoning'")
+    return data
+
+def generate_ats_explanation(score_data: dict) -> dict:
     try:
-        response = generate_answer(system_prompt, user_prompt)
-        response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        return data
+        return request_ats_explanation(score_data)
     except Exception as e:
         print(f"Error generating explanation: {e}")
         return {"reasoning": "Could not generate explanation.", "improvements": "N/A"}
@@ -103,6 +111,7 @@ def evaluate_application(application_id: str):
                 a.resume_document_id,
                 jp.raw_job_description_text,
                 jp.requirements, -- Cached JD requirements
+                jp.requirements_version,
                 d.source_path
             FROM applications a
             JOIN job_posts jp ON a.job_post_id = jp.id
@@ -117,33 +126,22 @@ def evaluate_application(application_id: str):
             print(f"Application {application_id} not found.")
             return
 
-        job_post_id, resume_id, jd_text, cached_requirements, resume_path = row
+        job_post_id, resume_id, jd_text, cached_requirements, requirements_version, resume_path = row
         
-        # Extract JD Requirements
-        if not cached_requirements:
+        # Extract JD Requirements (once per job, even with many concurrent callers)
+        if not cached_requirements or requirements_version != JD_EXTRACTOR_VERSION:
             print("Extracting JD requirements...")
-            jd_data = extract_jd_requirements(jd_text)
-            
-            cursor.execute(
-                "UPDATE job_posts SET requirements = %s WHERE id = %s",
-                (json.dumps(jd_data), job_post_id)
-            )
-            conn.commit()
+            extracted = ensure_jd_requirements([job_post_id], cursor=cursor)
+            if str(job_post_id) not in extracted:
+                raise RuntimeError(f"Could not extract requirements for job post {job_post_id}")
+            jd_data = extracted[str(job_post_id)]
         else:
             
             jd_data = cached_requirements if isinstance(cached_requirements, dict) else json.loads(cached_requirements)
 
-        # Extract Resume Data
-        if os.path.exists(resume_path):
-             raw_resume = read_pdf_text(resume_path)
-             cleaned_resume = clean_text(raw_resume)
-        else:
-              cursor.execute("SELECT content FROM document_sections WHERE document_id = %s", (resume_id,))
-              sec_rows = cursor.fetchall()
-              cleaned_resume = "\n".join([r[0] for r in sec_rows])
-        
-        print("Extracting Resume entities...")
-        resume_data = extract_resume_entities(cleaned_resume)
+        # Resume entities, cached once per document in documents.metadata
+        print("Loading Resume entities...")
+        resume_data = load_resume_entities(cursor, [resume_id])[str(resume_id)]
         
         #Calculate Score (Deterministic)
         print("Calculating deterministic score...")
@@ -152,13 +150,14 @@ def evaluate_application(application_id: str):
         # Explanation is now on-demand
         explanation = {"reasoning": "Click 'Generate Explanation' to view AI analysis.", "improvements": "N/A"}
         
-        full_breakdown = { # save for reference
-            "resume_data": resume_data,
-            "jd_data": jd_data,
+        # Only per-application results; resume entities and JD requirements are stored
+        # once per document / job and not copied into every application
+        full_breakdown = {
             "score_details": score_result,
             "explanation": explanation
         }
         
+        register_vocabulary(cursor)
         cursor.execute(
             """
             UPDATE applications
@@ -166,16 +165,24 @@ def evaluate_application(application_id: str):
                 ats_score = %s,
                 status = 'screened',
                 metadata = COALESCE(metadata, '{}'::jsonb) || %s::jsonb,
-                missing_skills = %s
+                missing_skills = %s,
+                skills_version = %s,
+                scoring_version = %s,
+                requirements_hash = %s
             WHERE id = %s
             """,
             (
                 score_result["score"],
                 json.dumps({"score_breakdown": full_breakdown}),
                 json.dumps(score_result["missing_must"]),
+                SKILLS_VERSION,
+                SCORING_VERSION,
+                requirements_hash(jd_data),
                 application_id
             )
         )
+        refresh_requirement_skills(cursor, {str(job_post_id): jd_data})
+        write_application_skills(cursor, [(application_id, job_post_id, score_result)])
         conn.commit()
         print(f"Scored Application {application_id}: {score_result['score']}/100")
         
@@ -191,19 +198,11 @@ def generate_ai_explanation(application_id: str):
     conn = get_connection()
     cursor = conn.cursor()
     try:
-        # Fetch necessary data
+        # Fetch only the score details the prompt needs
         cursor.execute(
             """
-            SELECT 
-                jp.raw_job_description_text,
-                d.source_path,
-                a.resume_document_id,
-                a.metadata->'score_breakdown'->>'score_details' as score_details,
-                a.metadata->'score_breakdown'->>'resume_data' as resume_data,
-                a.metadata->'score_breakdown' as full_breakdown
+            SELECT a.metadata->'score_breakdown'->'score_details'
             FROM applications a
-            JOIN job_posts jp ON a.job_post_id = jp.id
-            JOIN documents d ON a.resume_document_id = d.id
             WHERE a.id = %s
             """,
             (application_id,)
@@ -212,34 +211,21 @@ def generate_ai_explanation(application_id: str):
         if not row:
             return {"error": "Application not found"}
             
-        jd_text, resume_path, resume_id, score_details_json, resume_data_json, full_breakdown_json = row
-        
-        # Parse JSONs
-        score_data = json.loads(score_details_json) if isinstance(score_details_json, str) else score_details_json
-        full_breakdown = json.loads(full_breakdown_json) if isinstance(full_breakdown_json, str) else full_breakdown_json
-        
-        # Extract Resume Text
-        if os.path.exists(resume_path):
-             raw_resume = read_pdf_text(resume_path)
-             cleaned_resume = clean_text(raw_resume)
-        else:
-              cursor.execute("SELECT content FROM document_sections WHERE document_id = %s", (resume_id,))
-              sec_rows = cursor.fetchall()
-              cleaned_resume = "\n".join([r[0] for r in sec_rows])
+        score_details_json = row[0]
+        score_data = json.loads(score_details_json) if isinstance(score_details_json, str) else (score_details_json or {})
               
         # Generate Explanation
-        explanation = generate_ats_explanation(score_data, cleaned_resume, jd_text)
-        
-        # Update DB
-        full_breakdown["explanation"] = explanation
+        explanation = generate_ats_explanation(score_data)
         
+        # Update DB: replace only the explanation path
         cursor.execute(
             """
             UPDATE applications
-            SET metadata = metadata || %s::jsonb
+            SET metadata = jsonb_set(COALESCE(metadata, '{}'::jsonb), '{score_breakdown,explanation}', %s::jsonb, true)
             WHERE id = %s
+              AND metadata ? 'score_breakdown'
             """,
-            (json.dumps({"score_breakdown": full_breakdown}), application_id)
+            (json.dumps(explanation), application_id)
         )
         conn.commit()
         return explanation
@@ -250,4 +236,4 @@ def generate_ai_explanation(application_id: str):
         return {"reasoning": f"Error: {str(e)}", "improvements": "N/A"}
     finally:
         cursor.close()
-        conn.close()
\ No newline at end of file
+        conn.close()
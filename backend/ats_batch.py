@@ -0,0 +1,726 @@
+import hashlib
+import json
+import os
+import signal
+import socket
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+from psycopg2.extras import Json, execute_values
+
+from backend.ingestion import get_connection, read_pdf_text, clean_text
+from backend.skills import (
+    SKILLS_LIST,
+    SKILLS_VERSION,
+    SKILL_EXTRACTION_VERSION,
+    extract_skills_from_text_list,
+    requirement_skills,
+)
+
+# Vectorized version of backend.ats.calculate_ats_score.
+# Resumes and JDs are encoded as 0/1 matrices over the skill vocabulary, so the
+# matched counts for every (resume, job) pair come from one matrix product.
+
+# Bump when the formula in calculate_ats_score / _final_scores changes; stale rows are rescored
+SCORING_VERSION = "1"
+
+def requirements_hash(jd_data: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(jd_data, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+class BatchScorer:
+
+    def __init__(self, skills: Sequence[str] = None):
+        self.skills: Tuple[str, ...] = tuple(dict.fromkeys(SKILLS_LIST if skills is None else skills))
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+
+    def encode_resumes(self, resume_datas: Sequence[Dict[str, Any]]) -> np.ndarray:
+        # Skills outside the vocabulary can never match a JD skill, so they are dropped
+        matrix = np.zeros((len(resume_datas), len(self.skills)), dtype=np.float32)
+        for row, resume_data in enumerate(resume_datas):
+            for skill in resume_data.get("skills", []):
+                col = self.index.get(skill)
+                if col is not None:
+                    matrix[row, col] = 1.0
+        return matrix
+
+    def encode_jds(self, jd_datas: Sequence[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+        must = np.zeros((len(jd_datas), len(self.skills)), dtype=np.float32)
+        nice = np.zeros((len(jd_datas), len(self.skills)), dtype=np.float32)
+        for row, jd_data in enumerate(jd_datas):
+            for skill in extract_skills_from_text_list(jd_data.get("must_have", []), self.skills):
+                must[row, self.index[skill]] = 1.0
+            for skill in extract_skills_from_text_list(jd_data.get("nice_to_have", []), self.skills):
+                nice[row, self.index[skill]] = 1.0
+        return must, nice
+
+    def score_matrix(self, resumes: np.ndarray, must: np.ndarray, nice: np.ndarray) -> np.ndarray:
+        # (R, J) integer scores for every resume x job pair
+        matched_must = resumes @ must.T
+        matched_nice = resumes @ nice.T
+        return _final_scores(matched_must, matched_nice, must.sum(axis=1)[None, :], nice.sum(axis=1)[None, :])
+
+    def score_pairs(
+        self,
+        resumes: np.ndarray,
+        must: np.ndarray,
+        nice: np.ndarray,
+        resume_idx: Sequence[int],
+        job_idx: Sequence[int],
+    ) -> np.ndarray:
+        # Scores only for the listed (resume_idx[k], job_idx[k]) pairs, e.g. existing applications
+        resume_idx = np.asarray(resume_idx, dtype=np.int64)
+        job_idx = np.asarray(job_idx, dtype=np.int64)
+        r = resumes[resume_idx]
+        matched_must = np.einsum("pv,pv->p", r, must[job_idx])
+        matched_nice = np.einsum("pv,pv->p", r, nice[job_idx])
+        return _final_scores(matched_must, matched_nice, must.sum(axis=1)[job_idx], nice.sum(axis=1)[job_idx])
+
+    def decode(self, resume_row: np.ndarray, must_row: np.ndarray, nice_row: np.ndarray, score: int) -> Dict[str, Any]:
+        # Same shape as calculate_ats_score's result; only done for pairs we persist
+        has = resume_row > 0
+        return {
+            "score": int(score),
+            "matched_must": [self.skills[i] for i in np.flatnonzero((must_row > 0) & has)],
+            "missing_must": [self.skills[i] for i in np.flatnonzero((must_row > 0) & ~has)],
+            "matched_nice": [self.skills[i] for i in np.flatnonzero((nice_row > 0) & has)],
+            "missing_nice": [self.skills[i] for i in np.flatnonzero((nice_row > 0) & ~has)],
+        }
+
+def _final_scores(matched_must, matched_nice, len_must, len_nice) -> np.ndarray:
+    # Mirrors calculate_ats_score operation by operation in float64 so int() truncation matches exactly
+    matched_must = np.asarray(matched_must, dtype=np.float64)
+    matched_nice = np.asarray(matched_nice, dtype=np.float64)
+    len_must = np.broadcast_to(np.asarray(len_must, dtype=np.float64), matched_must.shape)
+    len_nice = np.broadcast_to(np.asarray(len_nice, dtype=np.float64), matched_must.shape)
+
+    has_must = len_must > 0
+    has_nice = len_nice > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio_must = np.where(has_must, matched_must / len_must, 0.0)
+        ratio_nice = np.where(has_nice, matched_nice / len_nice, 0.0)
+
+    both = ratio_must * 70 + ratio_nice * 30
+    only_nice = ratio_nice * 100
+    only_must = ratio_must * 100
+
+    final = np.where(
+        has_must & has_nice,
+        both,
+        np.where(has_must, only_must, np.where(has_nice, only_nice, 0.0)),
+    )
+    return final.astype(np.int64)
+
+def score_all(resume_datas: Sequence[Dict[str, Any]], jd_datas: Sequence[Dict[str, Any]]) -> np.ndarray:
+    scorer = BatchScorer()
+    resumes = scorer.encode_resumes(resume_datas)
+    must, nice = scorer.encode_jds(jd_datas)
+    return scorer.score_matrix(resumes, must, nice)
+
+# ----------------- Bulk scoring pipeline -----------------
+
+DEFAULT_CHUNK_SIZE = 500
+DEFAULT_CHECKPOINT_PATH = os.path.join(".cache", "ats_scoring_checkpoint.json")
+DEFAULT_EXPLANATION = {"reasoning": "Click 'Generate Explanation' to view AI analysis.", "improvements": "N/A"}
+
+_column_types: Dict[Tuple[str, str], str] = {}
+
+def _column_type(cursor, table: str, column: str) -> str:
+    # Parameters and VALUES lists arrive as text; cast them to the real key type so the join can use the primary key index
+    key = (table, column)
+    if key not in _column_types:
+        cursor.execute(
+            """
+            SELECT format_type(atttypid, atttypmod)
+            FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attname = %s
+            """,
+            (table, column),
+        )
+        _column_types[key] = cursor.fetchone()[0]
+    return _column_types[key]
+
+def _parse_json(value):
+    if value is None:
+        return None
+    return value if isinstance(value, (dict, list)) else json.loads(value)
+
+def load_job_requirements(cursor, job_ids: Sequence[Any]) -> Dict[str, Dict[str, List[str]]]:
+    from backend.retrieval import JD_EXTRACTOR_VERSION
+
+    id_type = _column_type(cursor, "job_posts", "id")
+    cursor.execute(
+        f"SELECT id, requirements, requirements_version FROM job_posts WHERE id = ANY(%s::{id_type}[])",
+        (list(job_ids),),
+    )
+    requirements = {}
+    missing = []
+    for job_id, cached, version in cursor.fetchall():
+        if cached and version == JD_EXTRACTOR_VERSION:
+            requirements[str(job_id)] = _parse_json(cached)
+        else:
+            missing.append(str(job_id))
+
+    if missing:
+        # Singleflight: concurrent workers wait on the same per-job lock instead of re-extracting
+        from backend.create_job_post import ensure_jd_requirements
+        requirements.update(ensure_jd_requirements(missing, cursor=cursor))
+
+    return requirements
+
+def register_vocabulary(cursor):
+    # Snapshot of SKILLS_LIST under SKILLS_VERSION; run in the same transaction as any write of
+    # applications.skills_version, so every recorded version can be diffed by backend.rescoring
+    cursor.execute(
+        "INSERT INTO skill_vocabularies (version, skills) VALUES (%s, %s) ON CONFLICT (version) DO NOTHING",
+        (SKILLS_VERSION, Json(list(SKILLS_LIST))),
+    )
+
+def refresh_requirement_skills(cursor, jd_by_job: Dict[str, Dict[str, Any]]):
+    # Skill -> job index (GIN on job_posts.requirement_skills) plus the requirements hash,
+    # used by backend.rescoring. Only rows that are out of date are rewritten.
+    if not jd_by_job:
+        return
+    id_type = _column_type(cursor, "job_posts", "id")
+    execute_values(
+        cursor,
+        f"""
+        UPDATE job_posts AS jp
+        SET
+            requirement_skills = v.skills::text[],
+            requirement_skills_version = v.version,
+            requirements_hash = v.requirements_hash
+        FROM (VALUES %s) AS v(id, skills, version, requirements_hash)
+        WHERE jp.id = v.id::{id_type}
+          AND (jp.requirement_skills_version IS DISTINCT FROM v.version
+               OR jp.requirements_hash IS DISTINCT FROM v.requirements_hash)
+        """,
+        [
+            (job_id, requirement_skills(jd_data), SKILLS_VERSION, requirements_hash(jd_data))
+            for job_id, jd_data in jd_by_job.items()
+        ],
+    )
+
+def _read_resume_text(cursor, resume_id, source_path) -> str:
+    # Same source preference as evaluate_application: original PDF, else stored sections
+    if source_path and os.path.exists(source_path):
+        return clean_text(read_pdf_text(source_path))
+    cursor.execute("SELECT content FROM document_sections WHERE document_id = %s ORDER BY section_index", (resume_id,))
+    return "\n".join(r[0] for r in cursor.fetchall())
+
+def load_resume_entities(cursor, resume_ids: Sequence[Any]) -> Dict[str, Dict[str, Any]]:
+    # Entities are cached in documents.metadata so each resume is parsed once per skill vocabulary
+    id_type = _column_type(cursor, "documents", "id")
+    cursor.execute(
+        f"SELECT id, source_path, metadata->'resume_entities' FROM documents WHERE id = ANY(%s::{id_type}[])",
+        (list(resume_ids),),
+    )
+    entities = {}
+    to_extract = []
+    for resume_id, source_path, cached in cursor.fetchall():
+        cached = _parse_json(cached)
+        if cached and cached.get("skills_version") == SKILL_EXTRACTION_VERSION:
+            entities[str(resume_id)] = cached
+        else:
+            to_extract.append((resume_id, source_path))
+
+    if to_extract:
+        from backend.retrieval import extract_resume_entities
+
+        updates = []
+        for resume_id, source_path in to_extract:
+            resume_data = extract_resume_entities(_read_resume_text(cursor, resume_id, source_path))
+            resume_data["skills_version"] = SKILL_EXTRACTION_VERSION
+            entities[str(resume_id)] = resume_data
+            updates.append((str(resume_id), json.dumps(resume_data)))
+
+        execute_values(
+            cursor,
+            f"""
+            UPDATE documents AS d
+            SET metadata = COALESCE(d.metadata, '{{}}'::jsonb) || jsonb_build_object('resume_entities', v.entities::jsonb)
+            FROM (VALUES %s) AS v(id, entities)
+            WHERE d.id = v.id::{id_type}
+            """,
+            updates,
+        )
+        cursor.connection.commit()
+        print(f"Cached entities for {len(updates)} resumes.")
+
+    return entities
+
+SKILL_KINDS = ("matched_must", "missing_must", "matched_nice", "missing_nice")
+
+def write_application_skills(cursor, results: Sequence[Tuple[Any, Any, Dict[str, Any]]]):
+    # results: (application_id, job_post_id, score_result). Replaces each application's rows.
+    if not results:
+        return
+    app_id_type = _column_type(cursor, "applications", "id")
+    job_id_type = _column_type(cursor, "job_posts", "id")
+
+    rows = []
+    for app_id, job_id, score_result in results:
+        for kind in SKILL_KINDS:
+            for skill in dict.fromkeys(s.strip().lower() for s in score_result.get(kind, [])):
+                if skill:
+                    rows.append((str(app_id), str(job_id), skill, kind))
+
+    cursor.execute(
+        f"DELETE FROM application_skills WHERE application_id = ANY(%s::{app_id_type}[])",
+        ([str(r[0]) for r in results],),
+    )
+    if rows:
+        # skills.id resolved by name inside this transaction (no per-process id cache that
+        # could outlive a rollback)
+        cursor.execute(
+            "INSERT INTO skills (name) SELECT unnest(%s::text[]) ON CONFLICT (name) DO NOTHING",
+            (sorted({r[2] for r in rows}),),
+        )
+        execute_values(
+            cursor,
+            f"""
+            INSERT INTO application_skills (application_id, job_post_id, skill_id, kind)
+            SELECT v.application_id::{app_id_type}, v.job_post_id::{job_id_type}, s.id, v.kind
+            FROM (VALUES %s) AS v(application_id, job_post_id, skill, kind)
+            JOIN skills s ON s.name = v.skill
+            """,
+            rows,
+            page_size=1000,
+        )
+
+def backfill_application_skills(chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    # One-off: fill application_skills from the score JSONB of applications scored before it existed
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        id_type = _column_type(cursor, "applications", "id")
+        last_id = None
+        total = 0
+        while True:
+            cursor.execute(
+                f"""
+                SELECT a.id, a.job_post_id, a.metadata->'score_breakdown'->'score_details', a.missing_skills
+                FROM applications a
+                WHERE a.ats_score IS NOT NULL
+                  AND (%s::{id_type} IS NULL OR a.id > %s::{id_type})
+                  AND NOT EXISTS (SELECT 1 FROM application_skills x WHERE x.application_id = a.id)
+                ORDER BY a.id
+                LIMIT %s
+                """,
+                (last_id, last_id, chunk_size),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = str(rows[-1][0])
+
+            results = []
+            for app_id, job_id, details, missing in rows:
+                details = _parse_json(details) or {}
+                if not isinstance(details, dict):
+                    details = {}
+                missing = _parse_json(missing)
+                if "missing_must" not in details and isinstance(missing, list):
+                    details["missing_must"] = missing
+                results.append((app_id, job_id, {k: details.get(k) or [] for k in SKILL_KINDS}))
+
+            write_application_skills(cursor, results)
+            conn.commit()
+            total += len(results)
+            print(f"Backfilled skills for {total} applications.")
+        return total
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error backfilling application skills: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def compact_score_breakdowns(chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    # One-off: strip the resume_data / jd_data copies from breakdowns written before
+    # they were stored by reference. Run VACUUM (or let autovacuum) afterwards to reclaim space.
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        id_type = _column_type(cursor, "applications", "id")
+        last_id = None
+        total = 0
+        while True:
+            cursor.execute(
+                f"""
+                WITH batch AS (
+                    SELECT id
+                    FROM applications
+                    WHERE (%s::{id_type} IS NULL OR id > %s::{id_type})
+                    ORDER BY id
+                    LIMIT %s
+                ), compacted AS (
+                    UPDATE applications AS a
+                    SET metadata = jsonb_set(
+                        a.metadata, '{{score_breakdown}}', (a.metadata->'score_breakdown') - 'resume_data' - 'jd_data'
+                    )
+                    FROM batch
+                    WHERE a.id = batch.id
+                      AND a.metadata->'score_breakdown' ?| ARRAY['resume_data', 'jd_data']
+                    RETURNING a.id
+                )
+                SELECT (SELECT id FROM batch ORDER BY id DESC LIMIT 1), (SELECT COUNT(*) FROM compacted)
+                """,
+                (last_id, last_id, chunk_size),
+            )
+            batch_last, compacted = cursor.fetchone()
+            conn.commit()
+            if batch_last is None:
+                break
+            last_id = str(batch_last)
+            total += compacted
+            print(f"Compacted {total} score breakdowns.")
+        return total
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error compacting score breakdowns: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def score_application_rows(
+    cursor,
+    app_rows: Sequence[Tuple[Any, Any, Any]],
+    scorer: BatchScorer = None,
+    claimed_by: str = None,
+) -> int:
+    # app_rows: (application_id, job_post_id, resume_document_id). Scores in memory, one UPDATE per call.
+    # With claimed_by, only rows still claimed by that worker are written and their claim is released.
+    if not app_rows:
+        return 0
+    scorer = scorer or BatchScorer()
+
+    jd_by_job = load_job_requirements(cursor, list(dict.fromkeys(str(r[1]) for r in app_rows)))
+    # Applications of jobs whose extraction failed stay unscored, to be picked up on a later run
+    skipped = [r for r in app_rows if str(r[1]) not in jd_by_job]
+    if skipped:
+        print(f"Skipping {len(skipped)} applications whose job requirements could not be extracted.")
+        app_rows = [r for r in app_rows if str(r[1]) in jd_by_job]
+        if not app_rows:
+            return 0
+
+    job_ids = list(dict.fromkeys(str(r[1]) for r in app_rows))
+    resume_ids = list(dict.fromkeys(str(r[2]) for r in app_rows))
+    resume_by_id = load_resume_entities(cursor, resume_ids)
+
+    job_pos = {job_id: i for i, job_id in enumerate(job_ids)}
+    resume_pos = {resume_id: i for i, resume_id in enumerate(resume_ids)}
+    jd_datas = [jd_by_job.get(job_id, {"must_have": [], "nice_to_have": []}) for job_id in job_ids]
+    resume_datas = [resume_by_id.get(resume_id, {"skills": []}) for resume_id in resume_ids]
+
+    resumes = scorer.encode_resumes(resume_datas)
+    must, nice = scorer.encode_jds(jd_datas)
+    resume_idx = [resume_pos[str(r[2])] for r in app_rows]
+    job_idx = [job_pos[str(r[1])] for r in app_rows]
+    scores = scorer.score_pairs(resumes, must, nice, resume_idx, job_idx)
+
+    job_hashes = [requirements_hash(jd_data) for jd_data in jd_datas]
+    refresh_requirement_skills(cursor, dict(zip(job_ids, jd_datas)))
+
+    updates = []
+    skill_results = {}
+    for (app_id, job_id, _), ri, ji, score in zip(app_rows, resume_idx, job_idx, scores):
+        score_result = scorer.decode(resumes[ri], must[ji], nice[ji], score)
+        skill_results[str(app_id)] = (app_id, job_id, score_result)
+        # Per-application results only: resume entities live in documents.metadata,
+        # JD requirements in job_posts.requirements
+        full_breakdown = {
+            "score_details": score_result,
+            "explanation": DEFAULT_EXPLANATION,
+        }
+        updates.append(
+            (
+                str(app_id),
+                score_result["score"],
+                json.dumps({"score_breakdown": full_breakdown}),
+                json.dumps(score_result["missing_must"]),
+                job_hashes[ji],
+            )
+        )
+
+    register_vocabulary(cursor)
+    id_type = _column_type(cursor, "applications", "id")
+    versions = [cursor.mogrify("%s", (v,)).decode() for v in (SKILLS_VERSION, SCORING_VERSION)]
+    claim_sql = ""
+    if claimed_by is not None:
+        claim_sql = "AND a.claimed_by = " + cursor.mogrify("%s", (claimed_by,)).decode()
+
+    updated = execute_values(
+        cursor,
+        f"""
+        UPDATE applications AS a
+        SET
+            ats_score = v.ats_score,
+            status = CASE WHEN a.status = 'new' THEN 'screened' ELSE a.status END,
+            metadata = COALESCE(a.metadata, '{{}}'::jsonb) || v.metadata::jsonb,
+            missing_skills = v.missing_skills::jsonb,
+            skills_version = {versions[0]},
+            scoring_version = {versions[1]},
+            requirements_hash = v.requirements_hash,
+            claimed_by = NULL,
+            claimed_at = NULL
+        FROM (VALUES %s) AS v(id, ats_score, metadata, missing_skills, requirements_hash)
+        WHERE a.id = v.id::{id_type} {claim_sql}
+        RETURNING a.id
+        """,
+        updates,
+        page_size=len(updates),
+        fetch=True,
+    )
+    # Only rows actually written (claim still held) get their skill outcomes replaced
+    written = [skill_results[str(r[0])] for r in updated]
+    write_application_skills(cursor, written)
+    return len(written)
+
+def score_application_ids(application_ids: Sequence[Any], chunk_size: int = DEFAULT_CHUNK_SIZE, cursor=None) -> int:
+    # Entry point for freshly created applications (auto-apply, apply_all).
+    # With cursor, scores on the caller's connection instead of checking out another one.
+    if not application_ids:
+        return 0
+
+    own_connection = cursor is None
+    if own_connection:
+        conn = get_connection()
+        cursor = conn.cursor()
+    else:
+        conn = cursor.connection
+    scorer = BatchScorer()
+
+    try:
+        id_type = _column_type(cursor, "applications", "id")
+        ids = [str(i) for i in application_ids]
+        scored = 0
+        for start in range(0, len(ids), chunk_size):
+            cursor.execute(
+                f"""
+                SELECT id, job_post_id, resume_document_id
+                FROM applications
+                WHERE id = ANY(%s::{id_type}[])
+                """,
+                (ids[start:start + chunk_size],),
+            )
+            scored += score_application_rows(cursor, cursor.fetchall(), scorer)
+            conn.commit()
+            print(f"Scored {scored}/{len(ids)} applications.")
+        return scored
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error scoring applications: {e}")
+        raise
+    finally:
+        if own_connection:
+            cursor.close()
+            conn.close()
+
+def _load_checkpoint(path: str) -> Dict[str, Any]:
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def _save_checkpoint(path: str, checkpoint: Dict[str, Any]):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+def score_pending_bulk(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    limit: int = None,
+    checkpoint_path: str = DEFAULT_CHECKPOINT_PATH,
+    resume: bool = False,
+) -> int:
+    conn = get_connection()
+    cursor = conn.cursor()
+    scorer = BatchScorer()
+
+    checkpoint = _load_checkpoint(checkpoint_path) if resume else {}
+    last_id = checkpoint.get("last_id")
+    scored = checkpoint.get("scored", 0)
+    if last_id:
+        print(f"Resuming after application {last_id} ({scored} already scored).")
+
+    try:
+        cursor.execute(
+            """
+            SELECT COUNT(*)
+            FROM applications
+            WHERE (status = 'new' OR ats_score IS NULL)
+              AND (%s::text IS NULL OR id > %s)
+            """,
+            (last_id, last_id),
+        )
+        total = cursor.fetchone()[0]
+        if limit:
+            total = min(total, limit)
+        print(f"Found {total} applications to score.")
+
+        started = time.perf_counter()
+        done = 0
+        while done < total:
+            batch = min(chunk_size, total - done)
+            # Keyset on id so a restart continues exactly where the last committed chunk ended
+            cursor.execute(
+                """
+                SELECT id, job_post_id, resume_document_id
+                FROM applications
+                WHERE (status = 'new' OR ats_score IS NULL)
+                  AND (%s::text IS NULL OR id > %s)
+                ORDER BY id
+                LIMIT %s
+                """,
+                (last_id, last_id, batch),
+            )
+            app_rows = cursor.fetchall()
+            if not app_rows:
+                break
+
+            score_application_rows(cursor, app_rows, scorer)
+            conn.commit()
+
+            done += len(app_rows)
+            scored += len(app_rows)
+            last_id = str(app_rows[-1][0])
+            if checkpoint_path:
+                _save_checkpoint(checkpoint_path, {"last_id": last_id, "scored": scored})
+
+            elapsed = time.perf_counter() - started
+            rate = done / elapsed if elapsed > 0 else 0.0
+            eta = (total - done) / rate if rate > 0 else 0.0
+            print(f"Scored {done}/{total} ({rate:.1f} apps/s, ETA {eta:.0f}s)")
+
+        if checkpoint_path and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path) # finished cleanly
+        print(f"Completed bulk scoring of {done} applications.")
+        return done
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error during bulk scoring: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+# ----------------- Multi-worker scoring -----------------
+
+DEFAULT_LEASE_SECONDS = 600 # claims older than this are considered abandoned
+DEFAULT_WORKER_BATCH_SIZE = 200
+
+def claim_batch(cursor, worker_id: str, batch_size: int, lease_seconds: int) -> List[Tuple[Any, Any, Any]]:
+    # SKIP LOCKED lets concurrent workers pick disjoint rows without waiting on each other
+    cursor.execute(
+        """
+        WITH claimable AS (
+            SELECT id
+            FROM applications
+            WHERE (status = 'new' OR ats_score IS NULL)
+              AND (claimed_at IS NULL OR claimed_at < NOW() - make_interval(secs => %s))
+            ORDER BY id
+            LIMIT %s
+            FOR UPDATE SKIP LOCKED
+        )
+        UPDATE applications AS a
+        SET claimed_by = %s, claimed_at = NOW()
+        FROM claimable c
+        WHERE a.id = c.id
+        RETURNING a.id, a.job_post_id, a.resume_document_id
+        """,
+        (lease_seconds, batch_size, worker_id),
+    )
+    return cursor.fetchall()
+
+def release_claims(cursor, worker_id: str):
+    cursor.execute(
+        """
+        UPDATE applications
+        SET claimed_by = NULL, claimed_at = NULL
+        WHERE claimed_by = %s AND (status = 'new' OR ats_score IS NULL)
+        """,
+        (worker_id,),
+    )
+
+def run_scoring_worker(
+    batch_size: int = DEFAULT_WORKER_BATCH_SIZE,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    worker_id: str = None,
+    exit_when_empty: bool = True,
+    poll_seconds: float = 5.0,
+) -> Dict[str, Any]:
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    stop = {"requested": False}
+
+    def request_stop(signum, frame):
+        # Finish the batch in hand, then exit
+        print(f"[{worker_id}] Shutdown requested, finishing current batch...")
+        stop["requested"] = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    scorer = BatchScorer()
+
+    scored = 0
+    batches = 0
+    started = time.perf_counter()
+    try:
+        while not stop["requested"]:
+            app_rows = claim_batch(cursor, worker_id, batch_size, lease_seconds)
+            conn.commit() # the claim is a lease, visible to other workers
+
+            if not app_rows:
+                if exit_when_empty:
+                    break
+                time.sleep(poll_seconds)
+                continue
+
+            try:
+                written = score_application_rows(cursor, app_rows, scorer, claimed_by=worker_id)
+                conn.commit()
+            except Exception as e:
+                # Keep the lease so the failing batch is not reclaimed in a tight loop
+                conn.rollback()
+                print(f"[{worker_id}] Error scoring batch: {e}")
+                continue
+
+            scored += written
+            batches += 1
+            elapsed = time.perf_counter() - started
+            print(f"[{worker_id}] Batch {batches}: scored {written} (total {scored}, {scored / elapsed:.1f} apps/s)")
+
+    finally:
+        try:
+            release_claims(cursor, worker_id)
+            conn.commit()
+        except Exception as e:
+            print(f"[{worker_id}] Error releasing claims: {e}")
+        cursor.close()
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    report = {
+        "worker_id": worker_id,
+        "scored": scored,
+        "batches": batches,
+        "elapsed_seconds": elapsed,
+        "apps_per_second": scored / elapsed if elapsed > 0 else 0.0,
+    }
+    print(f"[{worker_id}] Done: {report}")
+    return report
@@ -1,7 +1,11 @@
 
-from typing import Optional, Tuple
+import json
+from typing import Any, Dict, List, Optional, Tuple
 from psycopg2.extras import Json
-from backend.ingestion import get_connection, insert_document, insert_sections, clean_text
+from backend.ingestion import get_connection, insert_document, insert_sections, clean_text, invalidate_document_search
+from backend.ats_batch import _column_type, requirements_hash
+from backend.skills import SKILLS_VERSION, requirement_skills
+from backend.roles import get_or_create_role_family
 
 def create_jd_sections(raw_text: str):
     """
@@ -22,6 +26,159 @@ def create_jd_sections(raw_text: str):
     
     return sections
 
+def _insert_job_post(
+    cursor,
+    role_title: str,
+    department: Optional[str],
+    seniority: Optional[str],
+    location: Optional[str],
+    raw_JD_text: str,
+) -> Tuple[int, int]:
+    
+    role_family_id = get_or_create_role_family(cursor, role_title)
+
+    cursor.execute( #insert job_posts row
+        """
+        INSERT INTO job_posts (role_title, department, seniority, location, raw_job_description_text, role_family_id)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        RETURNING id;
+        """,
+        (role_title, department, seniority, location, raw_JD_text, role_family_id),
+    )
+    
+    job_post_id = cursor.fetchone()[0]
+    print("Inserted job_post ID:", job_post_id)
+    
+    
+    title = f"JD - {role_title}" #insert jd into documents table as job_description
+    jd_document_id = insert_document(
+        cursor=cursor,
+        title=title,
+        source_path="",
+        doc_type="job_description",
+    )
+    print("Inserted JD document ID:", jd_document_id)
+    
+    #create jd sections and insert into document_sections
+    jd_sections = create_jd_sections(raw_JD_text)
+    print("JD has", len(jd_sections), "sections.")
+    
+    insert_sections(
+        cursor=cursor,
+        document_id=jd_document_id,
+        sections=jd_sections,
+        doc_type="job_description",
+    )
+    
+    #link the job_posts with documents using document id
+    cursor.execute(
+        """
+        UPDATE job_posts
+        SET document_id = %s
+        WHERE id = %s;
+        """,
+        (jd_document_id, job_post_id),
+    )
+    
+    return job_post_id, jd_document_id
+
+def store_jd_requirements(cursor, job_post_id, requirements: Dict[str, List[str]], version: str):
+    cursor.execute(
+        """
+        UPDATE job_posts
+        SET
+            requirements = %s,
+            requirements_version = %s,
+            requirements_hash = %s,
+            requirement_skills = %s,
+            requirement_skills_version = %s
+        WHERE id = %s
+        """,
+        (
+            json.dumps(requirements),
+            version,
+            requirements_hash(requirements),
+            requirement_skills(requirements),
+            SKILLS_VERSION,
+            job_post_id,
+        ),
+    )
+
+def _lock_jd_requirements(cursor, job_post_ids: List[str]):
+    # Transaction-scoped advisory lock per job: one caller extracts, concurrent callers
+    # block here and then read the stored result. Sorted to avoid lock-order deadlocks.
+    for job_post_id in sorted(job_post_ids):
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtextextended('jd_requirements:' || %s, 0))",
+            (job_post_id,),
+        )
+
+def ensure_jd_requirements(job_post_ids: List[Any], force: bool = False, cursor=None) -> Dict[str, Dict[str, List[str]]]:
+    # Returns requirements per job, extracting only the missing/outdated ones.
+    # Jobs whose extraction failed are absent from the result.
+    # force=True re-extracts even when the stored version is current.
+    # With cursor, runs on the caller's connection (no second pool checkout); the per-job
+    # locks are then held until the caller commits.
+    job_post_ids = [str(job_post_id) for job_post_id in dict.fromkeys(job_post_ids)]
+    if not job_post_ids:
+        return {}
+
+    if cursor is not None:
+        return _ensure_jd_requirements(cursor, job_post_ids, force)
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        results = _ensure_jd_requirements(cursor, job_post_ids, force)
+        conn.commit() # releases the advisory locks
+        return results
+    
+    except Exception as e:
+        conn.rollback()
+        print("Error ensuring JD requirements:", e)
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+def _ensure_jd_requirements(cursor, job_post_ids: List[str], force: bool) -> Dict[str, Dict[str, List[str]]]:
+    # Import locally: backend.retrieval is heavy to import
+    from backend.retrieval import extract_jd_requirements_batch, JD_EXTRACTOR_VERSION
+
+    _lock_jd_requirements(cursor, job_post_ids)
+
+    # Re-read under the lock: another caller may have just finished extracting
+    id_type = _column_type(cursor, "job_posts", "id")
+    cursor.execute(
+        f"""
+        SELECT id, raw_job_description_text, requirements, requirements_version
+        FROM job_posts
+        WHERE id = ANY(%s::{id_type}[])
+        """,
+        (job_post_ids,),
+    )
+    results = {}
+    to_extract = {}
+    for job_post_id, jd_text, requirements, version in cursor.fetchall():
+        if requirements and version == JD_EXTRACTOR_VERSION and not force:
+            results[str(job_post_id)] = requirements if isinstance(requirements, dict) else json.loads(requirements)
+        else:
+            to_extract[str(job_post_id)] = jd_text or ""
+
+    if to_extract:
+        print(f"Extracting requirements for {len(to_extract)} job posts...")
+        # Forced runs must not get the previous answer back from the LLM cache
+        extracted = extract_jd_requirements_batch(to_extract, bypass_cache=force)
+        # Failed jobs are missing from extracted and keep their old version, so the next
+        # ensure/backfill retries them
+        for job_post_id, requirements in extracted.items():
+            store_jd_requirements(cursor, job_post_id, requirements, JD_EXTRACTOR_VERSION)
+            results[job_post_id] = requirements
+
+    return results
+
 def create_job_posts(
     role_title: str,
     department: Optional[str],
@@ -34,54 +191,14 @@ def create_job_posts(
     cursor = conn.cursor()
     
     try:
-        cursor.execute( #insert job_posts row
-            """
-            INSERT INTO job_posts (role_title, department, seniority, location, raw_job_description_text)
-            VALUES (%s, %s, %s, %s, %s)
-            RETURNING id;
-            """,
-            (role_title, department, seniority, location, raw_JD_text),
-        )
-        
-        job_post_id = cursor.fetchone()[0]
-        print("Inserted job_post ID:", job_post_id)
-        
-        
-        title = f"JD - {role_title}" #insert jd into documents table as job_description
-        jd_document_id = insert_document(
-            cursor=cursor,
-            title=title,
-            source_path="",
-            doc_type="job_description",
-        )
-        print("Inserted JD document ID:", jd_document_id)
-        
-        #create jd sections and insert into document_sections
-        jd_sections = create_jd_sections(raw_JD_text)
-        print("JD has", len(jd_sections), "sections.")
-        
-        insert_sections(
-            cursor=cursor,
-            document_id=jd_document_id,
-            sections=jd_sections,
-            doc_type="job_description",
-        )
-        
-        #link the job_posts with documents using document id
-        cursor.execute(
-            """
-            UPDATE job_posts
-            SET document_id = %s
-            WHERE id = %s;
-            """,
-            (jd_document_id, job_post_id),
+        job_post_id, jd_document_id = _insert_job_post(
+            cursor, role_title, department, seniority, location, raw_JD_text
         )
 
         conn.commit()
+        invalidate_document_search()
         print("Job post + JD ingestion completed.")
 
-        return job_post_id, jd_document_id
-    
     except Exception as e:
         conn.rollback()
         print("Error during job post creation:", e)
@@ -90,6 +207,77 @@ def create_job_posts(
     finally:
         cursor.close()
         conn.close()
+
+    # The job post exists even if extraction fails; scoring falls back to lazy extraction
+    try:
+        ensure_jd_requirements([job_post_id])
+    except Exception as e:
+        print(f"Error extracting requirements for job post {job_post_id}: {e}")
+
+    return job_post_id, jd_document_id
+
+def create_job_posts_bulk(job_posts: List[Dict[str, Any]]) -> List[Tuple[int, int]]:
+    # job_posts: dicts with role_title, department, seniority, location, raw_JD_text
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    created = []
+    try:
+        for post in job_posts:
+            job_post_id, jd_document_id = _insert_job_post(
+                cursor,
+                post["role_title"],
+                post.get("department"),
+                post.get("seniority"),
+                post.get("location"),
+                post["raw_JD_text"],
+            )
+            created.append((job_post_id, jd_document_id))
+
+        conn.commit()
+        invalidate_document_search()
+        print(f"Imported {len(created)} job posts.")
+
+    except Exception as e:
+        conn.rollback()
+        print("Error during bulk job post import:", e)
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+    try:
+        ensure_jd_requirements([job_post_id for job_post_id, _ in created])
+    except Exception as e:
+        print(f"Error extracting requirements for imported job posts: {e}")
+
+    return created
+
+def backfill_jd_requirements() -> int:
+    # Fills missing requirements and re-extracts those from an older extractor version
+    from backend.retrieval import JD_EXTRACTOR_VERSION
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute(
+            """
+            SELECT id
+            FROM job_posts
+            WHERE requirements IS NULL
+               OR requirements_version IS DISTINCT FROM %s
+            """,
+            (JD_EXTRACTOR_VERSION,),
+        )
+        job_post_ids = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"Found {len(job_post_ids)} job posts with missing or outdated requirements.")
+    return len(ensure_jd_requirements(job_post_ids))
         
 def create_applications(job_post_id: int, resume_document_id: int) -> int:
     conn = get_connection()
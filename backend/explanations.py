@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from psycopg2.extras import execute_values
+
+from backend.ingestion import get_connection
+from backend.ats import request_ats_explanation
+from backend.ats_batch import DEFAULT_EXPLANATION, _column_type, _parse_json
+
+# Bulk AI explanations for the top-N candidates of a job.
+# Requests run concurrently under a shared rate limit; finished explanations are
+# written back in batches, so an interrupted run resumes with whatever is still pending.
+
+EXPLANATION_CONCURRENCY = int(os.getenv("EXPLANATION_CONCURRENCY", "4"))
+EXPLANATION_RATE_PER_SECOND = float(os.getenv("EXPLANATION_RATE_PER_SECOND", "2"))
+DEFAULT_TOP_N = 10
+DEFAULT_WRITE_BATCH_SIZE = 10
+MAX_ATTEMPTS = 2
+
+# Placeholders that mean "no explanation yet" (including earlier failed single-candidate runs)
+PENDING_REASONINGS = [
+    DEFAULT_EXPLANATION["reasoning"],
+    "No assessment generated.",
+    "Could not generate explanation.",
+]
+
+class RateLimiter:
+    # Token bucket shared by all worker threads
+
+    def __init__(self, rate_per_second: float, burst: int = 1):
+        self.rate = rate_per_second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_for = (1 - self._tokens) / self.rate
+            time.sleep(wait_for)
+
+def select_pending_explanations(cursor, job_post_id, top_n: int = DEFAULT_TOP_N) -> List[Tuple[Any, int, Dict[str, Any]]]:
+    # Among the job's top-N scored candidates, those without a real explanation yet
+    cursor.execute(
+        """
+        SELECT id, ats_score, metadata->'score_breakdown'->'score_details', explained
+        FROM (
+            SELECT
+                a.id,
+                a.ats_score,
+                a.metadata,
+                COALESCE(a.metadata->'score_breakdown'->'explanation'->>'reasoning', '') <> ALL(%s) AS explained
+            FROM applications a
+            WHERE a.job_post_id = %s
+              AND a.ats_score IS NOT NULL
+              AND a.metadata ? 'score_breakdown'
+            ORDER BY a.ats_score DESC, a.id
+            LIMIT %s
+        ) top
+        WHERE NOT explained
+        """,
+        (PENDING_REASONINGS + [""], job_post_id, top_n),
+    )
+    return [(app_id, score, _parse_json(details) or {}) for app_id, score, details, _ in cursor.fetchall()]
+
+def write_explanations(cursor, results: Sequence[Tuple[Any, int, Dict[str, Any]]]) -> int:
+    # results: (application_id, ats_score it was explained for, explanation).
+    # Rows rescored in the meantime keep their placeholder.
+    if not results:
+        return 0
+    id_type = _column_type(cursor, "applications", "id")
+    execute_values(
+        cursor,
+        f"""
+        UPDATE applications AS a
+        SET metadata = jsonb_set(a.metadata, '{{score_breakdown,explanation}}', v.explanation::jsonb, true)
+        FROM (VALUES %s) AS v(id, ats_score, explanation)
+        WHERE a.id = v.id::{id_type}
+          AND a.ats_score = v.ats_score
+          AND a.metadata ? 'score_breakdown'
+        """,
+        [(str(app_id), score, json.dumps(explanation)) for app_id, score, explanation in results],
+        page_size=len(results),
+    )
+    return cursor.rowcount
+
+def _explain(score_details: Dict[str, Any], limiter: RateLimiter) -> Dict[str, Any]:
+    last_error = None
+    for attempt in range(MAX_ATTEMPTS):
+        limiter.acquire()
+        try:
+            # A retry skips the cache in case the stored answer was the unparseable one
+            return request_ats_explanation(score_details, bypass_cache=attempt > 0)
+        except Exception as e:
+            last_error = e
+    raise last_error
+
+def generate_explanations_for_job(
+    job_post_id,
+    top_n: int = DEFAULT_TOP_N,
+    concurrency: int = EXPLANATION_CONCURRENCY,
+    rate_per_second: float = EXPLANATION_RATE_PER_SECOND,
+    write_batch_size: int = DEFAULT_WRITE_BATCH_SIZE,
+    progress_callback=None,
+) -> Dict[str, int]:
+    conn = get_connection()
+    cursor = conn.cursor()
+    report = {"pending": 0, "written": 0, "failed": 0}
+
+    try:
+        pending = select_pending_explanations(cursor, job_post_id, top_n)
+        conn.commit() # don't hold a transaction open across LLM calls
+        report["pending"] = len(pending)
+        if not pending:
+            return report
+
+        limiter = RateLimiter(rate_per_second, burst=concurrency)
+        buffer = []
+        done = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="explain") as executor:
+            futures = {
+                executor.submit(_explain, details, limiter): (app_id, score)
+                for app_id, score, details in pending
+            }
+            for future in as_completed(futures):
+                app_id, score = futures[future]
+                done += 1
+                try:
+                    buffer.append((app_id, score, future.result()))
+                except Exception as e:
+                    report["failed"] += 1
+                    print(f"Error generating explanation for application {app_id}: {e}")
+
+                if len(buffer) >= write_batch_size or done == len(pending):
+                    report["written"] += write_explanations(cursor, buffer)
+                    conn.commit()
+                    buffer = []
+                if progress_callback is not None:
+                    progress_callback(done, len(pending))
+
+        print(f"Job {job_post_id}: wrote {report['written']}/{report['pending']} explanations, {report['failed']} failed.")
+        return report
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error generating explanations for job {job_post_id}: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def generate_explanations_for_all_jobs(top_n: int = DEFAULT_TOP_N, job_ids: Optional[Sequence[Any]] = None, **kwargs) -> Dict[str, int]:
+    if job_ids is None:
+        conn = get_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT DISTINCT job_post_id FROM applications WHERE ats_score IS NOT NULL")
+            job_ids = [r[0] for r in cursor.fetchall()]
+        finally:
+            cursor.close()
+            conn.close()
+
+    totals = {"pending": 0, "written": 0, "failed": 0}
+    for job_id in job_ids:
+        report = generate_explanations_for_job(job_id, top_n=top_n, **kwargs)
+        for key in totals:
+            totals[key] += report[key]
+    return totals
@@ -0,0 +1,244 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+# Local OpenAI-compatible stand-in for benchmarks and load tests.
+# Point backend.llm at it with LLM_BACKEND=fake (and FAKE_LLM_BASE_URL if not on the default port).
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8088
+
+DEFAULT_CONFIG = {
+    "latency_median_ms": 300.0, # lognormal median
+    "latency_sigma": 0.5, # lognormal shape, 0 = fixed latency
+    "error_rate": 0.0, # fraction of requests answered with HTTP 503
+    "chunk_delay_ms": 5.0, # delay between streamed chunks
+    "seed": None,
+    "responses": {}, # canned answers: substring of the user prompt -> response text
+}
+
+_WORD_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+#./-]{2,}")
+
+def _prompt_parts(messages: List[Dict[str, str]]) -> Tuple[str, str]:
+    system = "\n".join(m.get("content", "") for m in messages if m.get("role") == "system")
+    user = "\n".join(m.get("content", "") for m in messages if m.get("role") == "user")
+    return system, user
+
+def _distinct_words(text: str) -> List[str]:
+    seen = []
+    for word in _WORD_RE.findall(text.lower()):
+        if word not in seen:
+            seen.append(word)
+    return seen
+
+def _requirements_from(text: str) -> Dict[str, List[str]]:
+    words = _distinct_words(text)
+    return {"must_have": words[:8], "nice_to_have": words[8:12]}
+
+def render_response(messages: List[Dict[str, str]], config: Dict[str, Any]) -> str:
+    system, user = _prompt_parts(messages)
+
+    for needle, canned in config.get("responses", {}).items():
+        if needle in user:
+            return canned
+
+    # Templated answers shaped like the prompts in backend/retrieval.py and backend/ats.py
+    if "keyed by job id" in system:
+        blocks = re.findall(r"Job ID: (\S+)\n(.*?)(?=\n\n---\n\n|\Z)", user, re.S)
+        return json.dumps({job_id: _requirements_from(text) for job_id, text in blocks})
+
+    if "'must_have'" in system:
+        return json.dumps(_requirements_from(user))
+
+    if "'reasoning'" in system:
+        return json.dumps(
+            {
+                "reasoning": "Candidate covers most required skills; see missing_must for gaps.",
+                "improvements": "Gain hands-on experience with the missing required skills.",
+            }
+        )
+
+    words = _distinct_words(user)
+    return "Fake answer based on: " + ", ".join(words[:20])
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    server_version = "FakeLLM/0.1"
+
+    def log_message(self, format, *args): # keep benchmark output clean
+        pass
+
+    def _send_json(self, status: int, payload: Dict[str, Any]):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "fake", "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        config = self.server.config
+        messages = request.get("messages", [])
+        model = request.get("model", "fake")
+
+        with self.server.rng_lock:
+            latency_ms = self.server.sample_latency_ms()
+            fail = self.server.rng.random() < config["error_rate"]
+        time.sleep(latency_ms / 1000.0)
+
+        if fail:
+            self._send_json(503, {"error": {"message": "fake upstream error", "type": "server_error"}})
+            return
+
+        content = render_response(messages, config)
+        completion_id = "chatcmpl-" + hashlib.sha1(json.dumps(messages).encode("utf-8")).hexdigest()[:16]
+        created = int(time.time())
+
+        if request.get("stream"):
+            self._stream(completion_id, created, model, content, config)
+            return
+
+        prompt_tokens = sum(len(m.get("content", "").split()) for m in messages)
+        completion_tokens = len(content.split())
+        self._send_json(
+            200,
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    def _stream(self, completion_id: str, created: int, model: str, content: str, config: Dict[str, Any]):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        pieces = re.findall(r"\S+\s*", content) or [""]
+        try:
+            for i, piece in enumerate(pieces):
+                delta = {"content": piece}
+                if i == 0:
+                    delta["role"] = "assistant"
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+                time.sleep(config["chunk_delay_ms"] / 1000.0)
+
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            }
+            self.wfile.write(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass # client cancelled (e.g. lost a hedge)
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config: Optional[Dict[str, Any]] = None):
+        super().__init__(address, FakeLLMHandler)
+        self.config = dict(DEFAULT_CONFIG)
+        self.config.update(config or {})
+        self.rng = random.Random(self.config["seed"])
+        self.rng_lock = threading.Lock()
+
+    def sample_latency_ms(self) -> float:
+        median = self.config["latency_median_ms"]
+        sigma = self.config["latency_sigma"]
+        if sigma <= 0:
+            return median
+        return self.rng.lognormvariate(0.0, sigma) * median
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+def start_fake_server(host: str = DEFAULT_HOST, port: int = 0, **config) -> FakeLLMServer:
+    # port=0 picks a free port; read it back from server.base_url
+    server = FakeLLMServer((host, port), config)
+    thread = threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible fake LLM server.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-median-ms", type=float, default=DEFAULT_CONFIG["latency_median_ms"])
+    parser.add_argument("--latency-sigma", type=float, default=DEFAULT_CONFIG["latency_sigma"])
+    parser.add_argument("--error-rate", type=float, default=DEFAULT_CONFIG["error_rate"])
+    parser.add_argument("--chunk-delay-ms", type=float, default=DEFAULT_CONFIG["chunk_delay_ms"])
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--responses", help="JSON file mapping prompt substrings to canned responses")
+    args = parser.parse_args()
+
+    responses = {}
+    if args.responses:
+        with open(args.responses, "r", encoding="utf-8") as f:
+            responses = json.load(f)
+
+    server = FakeLLMServer(
+        (args.host, args.port),
+        {
+            "latency_median_ms": args.latency_median_ms,
+            "latency_sigma": args.latency_sigma,
+            "error_rate": args.error_rate,
+            "chunk_delay_ms": args.chunk_delay_ms,
+            "seed": args.seed,
+            "responses": responses,
+        },
+    )
+    print(f"Fake LLM server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,27 @@
-import psycopg2, os
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from psycopg2.extras import Json
 from pypdf import PdfReader
 from pathlib import Path
-import streamlit as st
+
+# Document search results cached in-process; cleared whenever this process inserts a
+# document, and expired after DOCUMENT_SEARCH_TTL_SECONDS for writes from other processes.
+DOCUMENT_SEARCH_TTL_SECONDS = float(os.getenv("DOCUMENT_SEARCH_TTL_SECONDS", "60"))
+DOCUMENT_SEARCH_CACHE_SIZE = 256
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "4"))
+
+_document_search_lock = threading.Lock()
+_document_search_cache = OrderedDict()
 
 def get_connection():
-    return psycopg2.connect(
-        host=st.secrets["DB_HOST"],
-        port=int(st.secrets["DB_PORT"]),
-        dbname=st.secrets["DB_NAME"],
-        user=st.secrets["DB_USER"],
-        password=st.secrets["DB_PASSWORD"],
-        sslmode="require",
-    )
+    # Pooled connection shared process-wide (backend/resources.py); close() returns it to the pool
+    from backend.resources import get_registry
+    return get_registry().get_connection()
+
 def insert_document(cursor, title, source_path, doc_type="resume"):
     doc_metadata={
         "doc_type": doc_type,
@@ -31,6 +40,63 @@ def insert_document(cursor, title, source_path, doc_type="resume"):
     document_id = cursor.fetchone()[0]
     return document_id
 
+def invalidate_document_search():
+    # Call after committing new documents; earlier, a concurrent search re-caches stale results
+    with _document_search_lock:
+        _document_search_cache.clear()
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def search_documents(query="", doc_type=None, limit=20, offset=0):
+    # Title search for pickers: prefix matches first, then trigram similarity (pg_trgm GIN index).
+    # Returns [(id, title, doc_type)].
+    query = (query or "").strip()
+    key = (query.lower(), doc_type, limit, offset)
+    now = time.monotonic()
+
+    with _document_search_lock:
+        cached = _document_search_cache.get(key)
+        if cached is not None and now - cached[0] < DOCUMENT_SEARCH_TTL_SECONDS:
+            _document_search_cache.move_to_end(key)
+            return cached[1]
+
+    params = {"doc_type": doc_type, "limit": limit, "offset": offset}
+    if query:
+        params.update(q=query, prefix=_like_escape(query) + "%", contains="%" + _like_escape(query) + "%")
+        sql = """
+            SELECT id, title, doc_type
+            FROM documents
+            WHERE (%(doc_type)s::text IS NULL OR doc_type = %(doc_type)s)
+              AND (title ILIKE %(contains)s OR title %% %(q)s)
+            ORDER BY title ILIKE %(prefix)s DESC, similarity(title, %(q)s) DESC, title, id
+            LIMIT %(limit)s OFFSET %(offset)s;
+        """
+    else:
+        sql = """
+            SELECT id, title, doc_type
+            FROM documents
+            WHERE (%(doc_type)s::text IS NULL OR doc_type = %(doc_type)s)
+            ORDER BY title, id
+            LIMIT %(limit)s OFFSET %(offset)s;
+        """
+
+    conn = get_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(sql, params)
+        results = [(str(r[0]), r[1], r[2]) for r in cursor.fetchall()]
+    finally:
+        cursor.close()
+        conn.close()
+
+    with _document_search_lock:
+        _document_search_cache[key] = (now, results)
+        _document_search_cache.move_to_end(key)
+        while len(_document_search_cache) > DOCUMENT_SEARCH_CACHE_SIZE:
+            _document_search_cache.popitem(last=False)
+    return results
+
 def read_pdf_text(pdf_path):
     reader = PdfReader(pdf_path)
     all_text = ""
@@ -127,56 +193,47 @@ def insert_sections(cursor, document_id, sections, doc_type="resume"):
 def auto_apply_and_score(cursor, document_id):
     print(f"Auto-applying document {document_id} to all jobs...")
     
-    # Get all Job IDs
-    cursor.execute("SELECT id FROM job_posts")
-    job_ids = [row[0] for row in cursor.fetchall()]
+    # Link Resume to every Job Description in one statement (Create Applications)
+    cursor.execute(
+        """
+        INSERT INTO applications (job_post_id, resume_document_id, status, created_at, updated_at)
+        SELECT jp.id, d.id, 'new', NOW(), NOW()
+        FROM job_posts jp
+        CROSS JOIN documents d
+        WHERE d.id = %s
+        ON CONFLICT (job_post_id, resume_document_id) DO NOTHING
+        RETURNING id
+        """,
+        (document_id,)
+    )
+    created_apps = [row[0] for row in cursor.fetchall()]
+    cursor.connection.commit() 
+
+    # Existing applications of this resume that never got a score (e.g. an earlier run failed)
+    cursor.execute(
+        """
+        SELECT id FROM applications
+        WHERE resume_document_id = %s AND ats_score IS NULL
+        """,
+        (document_id,)
+    )
+    to_score = list(dict.fromkeys(created_apps + [row[0] for row in cursor.fetchall()]))
     
-    if not job_ids:
-        print("No job posts found. Skipping application.")
-        return
+    if not to_score:
+        print("No new or unscored applications. Skipping scoring.")
+        return 0
 
-    # Link Resume to Job Descriptions (Create Applications)
-    created_apps = []
+    print(f"Created {len(created_apps)} applications, {len(to_score)} to score. Starting scoring...")
     
     # Import locally to avoid top-level circular dependency
-    from backend.ats import evaluate_application
+    from backend.ats_batch import score_application_ids
     
-    for job_id in job_ids:
-        cursor.execute(
-            "SELECT id FROM applications WHERE job_post_id = %s AND resume_document_id = %s",
-            (job_id, document_id)
-        )
-        existing = cursor.fetchone()
-        
-        if existing:
-            app_id = existing[0]
-        else:
-            # Create new
-            try:
-                cursor.execute(
-                    """
-                    INSERT INTO applications (job_post_id, resume_document_id, status, created_at, updated_at)
-                    VALUES (%s, %s, 'new', NOW(), NOW())
-                    RETURNING id
-                    """,
-                    (job_id, document_id)
-                )
-                app_id = cursor.fetchone()[0]
-            except Exception as e:
-                print(f"Error creating application for job {job_id}: {e}")
-                continue
-                
-        created_apps.append(app_id)
-    cursor.connection.commit() 
-    print(f"Created/Found {len(created_apps)} applications. Starting scoring...")
-    
-    # Calculate ATS Score for each application
-    for app_id in created_apps:
-        try:
-            print(f"Scoring App ID: {app_id}")
-            evaluate_application(str(app_id))
-        except Exception as e:
-            print(f"Error auto-scoring app {app_id}: {e}")
+    # Calculate ATS Score for all new and unscored applications at once
+    try:
+        score_application_ids(to_score, cursor=cursor)
+    except Exception as e:
+        print(f"Error auto-scoring document {document_id}: {e}")
+    return len(created_apps)
 
 def batch_ingestion(folder_path):
     folder_path = os.path.abspath(folder_path)
@@ -185,28 +242,31 @@ def batch_ingestion(folder_path):
         print("Folder does not exist:", folder_path)
         return
     
-    for filename in os.listdir(folder_path):
-        if not filename.lower().endswith(".pdf"):
-            continue
-        
-        pdf_path = os.path.join(folder_path, filename)
-        
-        try:
-            main(pdf_path)
-        except Exception as e:
-            print("Error ingesting", pdf_path, ":", e)
+    files = [
+        (os.path.join(folder_path, filename), None)
+        for filename in sorted(os.listdir(folder_path))
+        if filename.lower().endswith(".pdf")
+    ]
+    return ingest_pdfs_parallel(files)
 
 
-def main(pdf_path, original_filename=None):
+def ingest_pdf(pdf_path, original_filename=None):
+    # Full pipeline for one resume; raises on failure.
+    # Returns stats for display: sections, tokens, applications and per-stage timings (seconds).
+    timings = {}
+    started = time.perf_counter()
+
+    def lap(stage, since):
+        now = time.perf_counter()
+        timings[stage] = now - since
+        return now
+
     conn = get_connection()
     cursor = conn.cursor()
     
     try:
-        # Insert Document Row
-        title = original_filename if original_filename else Path(pdf_path).name
-        document_id = insert_document(cursor, title, pdf_path, doc_type="resume")
-        print ("Inserted document ID:", document_id)
-        
+        t = time.perf_counter()
+
         # Read PDF
         raw_text = read_pdf_text(pdf_path)
         print("Raw text length:", len(raw_text))
@@ -214,46 +274,99 @@ def main(pdf_path, original_filename=None):
         # Clean text
         cleaned = clean_text(raw_text)
         print("Cleaned text length:", len(cleaned))
+        t = lap("read", t)
 
         # Extract sections (summary, experience, education)
         sections = extract_sections(cleaned)
         print("Extracted section labels:", [s["label"] for s in sections])
+        t = lap("sections", t)
 
-        # Insert sections
+        # Insert Document Row + sections
+        title = original_filename if original_filename else Path(pdf_path).name
+        document_id = insert_document(cursor, title, pdf_path, doc_type="resume")
+        print ("Inserted document ID:", document_id)
         insert_sections(cursor, document_id, sections, doc_type="resume")
-
-        # Commit changes to DB
-        conn.commit()
+        t = lap("insert", t)
         print("Ingestion completed. Starting embedding generation...")
         
-        # Embed sections
+        # Embed this document's sections only (parallel ingestions must not embed each other's).
+        # Committed together with the insert: if embedding fails nothing is kept, so a retry
+        # doesn't leave an un-embedded duplicate behind.
         # to avoid circular dependency at module level
         from backend.retrieval import embed_resume_sections
-        embed_resume_sections(cursor)
+        embedded = embed_resume_sections(cursor, document_id=document_id)
         conn.commit()
+        invalidate_document_search()
+        t = lap("embed", t)
         
         # Auto-apply and calculate ATS Score
+        applications = 0
         try:
-            auto_apply_and_score(cursor, document_id)
+            applications = auto_apply_and_score(cursor, document_id)
         except Exception as e:
             print(f"Error during auto-apply/score: {e}")
-            
+        lap("score", t)
+        timings["total"] = time.perf_counter() - started
 
-            
-        return document_id
+        return {
+            "document_id": document_id,
+            "title": title,
+            "source_path": pdf_path,
+            "sections": len(sections),
+            "section_labels": [s["label"] for s in sections],
+            "tokens": len(cleaned.split()), # whitespace tokens
+            "embedded_sections": embedded,
+            "applications": applications,
+            "timings": timings,
+        }
         
-    except Exception as e:
+    except Exception:
         conn.rollback()
-        print("Error during Ingestion:", e)
+        raise
         
     finally:
         cursor.close()
         conn.close()
-  
+
+
+def ingest_pdfs_parallel(files, max_workers=INGEST_WORKERS, progress_callback=None):
+    # files: [(pdf_path, original_filename or None)]. Each file runs on its own connection.
+    # progress_callback(done, total, stats) is called from the calling thread as files finish.
+    # Returns stats per file in input order; failures carry an "error" key instead of raising.
+    results = [None] * len(files)
+    if not files:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ingest") as executor:
+        futures = {
+            executor.submit(ingest_pdf, pdf_path, original_filename): i
+            for i, (pdf_path, original_filename) in enumerate(files)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            pdf_path, original_filename = files[i]
+            try:
+                stats = future.result()
+            except Exception as e:
+                print("Error ingesting", pdf_path, ":", e)
+                stats = {"title": original_filename or Path(pdf_path).name, "source_path": pdf_path, "error": str(e)}
+            results[i] = stats
+            if progress_callback is not None:
+                progress_callback(done, len(files), stats)
+
+    return results
+
+
+def main(pdf_path, original_filename=None):
+    try:
+        return ingest_pdf(pdf_path, original_filename)["document_id"]
+    except Exception as e:
+        print("Error during Ingestion:", e)
+
 if __name__ == "__main__":
-    
-    # PDF_PATH = "C:/Users/A/OneDrive/Projects/rag-knowledge-assistant/data/Nabil Yusaidi Resume.pdf"
-    # main(PDF_PATH)
-    
-    FOLDER_PATH = "C:/Users/A/OneDrive/Projects/rag-knowledge-assistant/data/Data Science"
-    batch_ingestion(FOLDER_PATH)
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m backend.ingestion <folder with PDF resumes>")
+        sys.exit(1)
+    batch_ingestion(sys.argv[1])
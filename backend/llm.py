@@ -1,67 +1,284 @@
 from openai import OpenAI
 from google import genai
-from typing import Any, List, Dict
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import os
+import time
+import threading
 from dotenv import load_dotenv
 
+from backend import llm_cache
+
 load_dotenv()
 
 MODEL_NAME = "gemini-3-flash-preview"
 FALLBACK_MODEL_NAME = "Qwen/Qwen2.5-1.5B-Instruct:featherless-ai"
 
-_client = None
-_fallback_client = None
+# "fake" routes both clients to the local stand-in in backend/fake_llm.py (benchmarks, offline runs)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "remote").lower()
+FAKE_LLM_BASE_URL = os.getenv("FAKE_LLM_BASE_URL", "http://127.0.0.1:8088/v1")
+
+# Hedging: if the primary has not answered within its observed p95 latency,
+# a second request is sent to the fallback model and the first good answer wins.
+HEDGE_PERCENTILE = 0.95
+HEDGE_MIN_SAMPLES = 20 # below this we use the static threshold
+HEDGE_AFTER_SECONDS = float(os.getenv("LLM_HEDGE_AFTER_SECONDS", "8"))
+# Per-request HTTP timeout; also bounds a streamed call that stalls before its first chunk,
+# which can't see the hedge's cancel_event until a chunk arrives
+LLM_REQUEST_TIMEOUT_SECONDS = float(os.getenv("LLM_REQUEST_TIMEOUT_SECONDS", "60"))
+# Concurrent hedged calls; primaries and hedges use separate pools so stalled
+# primaries can't starve the fallback requests meant to rescue them
+HEDGE_MAX_IN_FLIGHT = int(os.getenv("LLM_HEDGE_MAX_IN_FLIGHT", "32"))
+
+_primary_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_IN_FLIGHT, thread_name_prefix="llm-primary")
+_hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_IN_FLIGHT, thread_name_prefix="llm-hedge")
+_stats_lock = threading.Lock()
+_primary_latencies = deque(maxlen=500) # primary call latencies, seconds
+_hedged_call_latencies = deque(maxlen=500) # end-to-end latency of hedged calls
+_hedge_stats = {"calls": 0, "hedged": 0, "primary_wins": 0, "fallback_wins": 0, "failures": 0}
+
+class HedgeCancelled(Exception):
+    pass
+
+def _build_llm() -> OpenAI:
+    if LLM_BACKEND == "fake":
+        return OpenAI(base_url=FAKE_LLM_BASE_URL, api_key="fake")
+    return OpenAI(
+        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
+        api_key=os.getenv("GEMINI_API_KEY"),
+    )
+
+def _build_fallback_llm() -> OpenAI:
+    if LLM_BACKEND == "fake":
+        return OpenAI(base_url=FAKE_LLM_BASE_URL, api_key="fake")
+    return OpenAI(
+        base_url="https://router.huggingface.co/v1",
+        api_key=os.getenv("HF_TOKEN"),
+    )
 
+# Clients (and their HTTP connection pools) are shared process-wide via the resource registry
 def get_llm() -> OpenAI:
-    global _client
-    if _client is None:
-        _client = OpenAI(
-            base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-            api_key=os.getenv("GEMINI_API_KEY"),
-        )
-    return _client
+    from backend.resources import get_registry
+    return get_registry().get("llm_primary", _build_llm)
 
 def _get_fallback_llm() -> OpenAI:
-    global _fallback_client
-    if _fallback_client is None:
-        _fallback_client = OpenAI(
-            base_url="https://router.huggingface.co/v1",
-            api_key=os.getenv("HF_TOKEN"),
-        )
-    return _fallback_client
+    from backend.resources import get_registry
+    return get_registry().get("llm_fallback", _build_fallback_llm)
 
 def build_prompt_structure(system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
-    
+
     return[
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
-    
-def generate_answer(system_prompt: str, user_prompt: str, max_new_tokens: int = 2048) -> str:
-    messages = build_prompt_structure(system_prompt, user_prompt)
 
-    try:
-        client = get_llm()
+def _complete(client: OpenAI, model: str, messages, max_new_tokens: int, cancel_event: Optional[threading.Event] = None) -> str:
+    if cancel_event is None:
         response = client.chat.completions.create(
-            model=MODEL_NAME,
+            model=model,
             messages=messages,
             temperature=0.3,
             max_tokens=max_new_tokens,
             top_p=0.9,
+            timeout=LLM_REQUEST_TIMEOUT_SECONDS,
         )
         msg = response.choices[0].message.content
         return msg.strip() if msg else ""
+
+    # Streamed so the losing side of a hedge can drop its connection mid-answer
+    stream = client.chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=max_new_tokens,
+        top_p=0.9,
+        stream=True,
+        timeout=LLM_REQUEST_TIMEOUT_SECONDS,
+    )
+    parts = []
+    try:
+        for chunk in stream:
+            if cancel_event.is_set():
+                raise HedgeCancelled()
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+    finally:
+        stream.close()
+    return "".join(parts).strip()
+
+def _percentile(values, q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+def get_hedge_threshold() -> float:
+    with _stats_lock:
+        samples = list(_primary_latencies)
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return HEDGE_AFTER_SECONDS
+    return _percentile(samples, HEDGE_PERCENTILE)
+
+def get_hedge_stats() -> Dict[str, Any]:
+    with _stats_lock:
+        stats = dict(_hedge_stats)
+        latencies = list(_hedged_call_latencies)
+    stats["hedge_rate"] = stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+    stats["threshold_seconds"] = get_hedge_threshold()
+    stats["p50_seconds"] = _percentile(latencies, 0.50)
+    stats["p95_seconds"] = _percentile(latencies, 0.95)
+    stats["p99_seconds"] = _percentile(latencies, 0.99)
+    return stats
+
+def _record_primary_latency(seconds: float):
+    with _stats_lock:
+        _primary_latencies.append(seconds)
+
+def _run_primary(messages, max_new_tokens: int, cancel_event: threading.Event) -> str:
+    start = time.perf_counter()
+    try:
+        answer = _complete(get_llm(), MODEL_NAME, messages, max_new_tokens, cancel_event)
+    except HedgeCancelled:
+        # Lower bound of the real latency, still better than dropping the sample
+        _record_primary_latency(time.perf_counter() - start)
+        raise
+    _record_primary_latency(time.perf_counter() - start)
+    return answer
+
+def _run_fallback(messages, max_new_tokens: int, cancel_event: threading.Event) -> str:
+    return _complete(_get_fallback_llm(), FALLBACK_MODEL_NAME, messages, max_new_tokens, cancel_event)
+
+def _generate_hedged(messages, max_new_tokens: int, validate: Optional[Callable[[str], bool]] = None) -> Tuple[str, Optional[str]]:
+    # Only an answer that passes validate wins the race; a fast malformed answer is kept
+    # as a last resort while the other side is still running.
+    start = time.perf_counter()
+    cancel_event = threading.Event()
+    winner = None
+    hedged = False
+
+    def acceptable(future) -> bool:
+        return future.exception() is None and bool(future.result()) and _is_valid(future.result(), validate)
+
+    primary = _primary_executor.submit(_run_primary, messages, max_new_tokens, cancel_event)
+    pending = {primary}
+    done, _ = wait(pending, timeout=get_hedge_threshold())
+
+    if not done or not acceptable(primary):
+        if done:
+            reason = primary.exception() or ("empty answer" if not primary.result() else "invalid answer")
+            print(f"Primary model failed ({reason}), switching to fallback...")
+        else:
+            print("Primary model is slow, sending hedge request to fallback...")
+            hedged = True
+        pending.add(_hedge_executor.submit(_run_fallback, messages, max_new_tokens, cancel_event))
+
+    answer = None
+    best_effort = None # (answer, side) of the first non-empty answer that failed validation
+    last_error = None
+    finished = {primary} if done else set()
+    try:
+        for future in finished:
+            if acceptable(future):
+                answer, winner = future.result(), "primary"
+            elif future.exception() is None and future.result():
+                best_effort = (future.result(), "primary")
+            pending.discard(future)
+        while pending and answer is None:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                side = "primary" if future is primary else "fallback"
+                if future.exception() is not None:
+                    last_error = future.exception()
+                elif answer is None and acceptable(future):
+                    answer, winner = future.result(), side
+                elif future.result() and best_effort is None:
+                    best_effort = (future.result(), side)
+    finally:
+        # Loser stops reading its stream (or never starts)
+        cancel_event.set()
+        for future in pending:
+            future.cancel()
+
+    if answer is None and best_effort is not None:
+        # Nothing validated: hand back the best available answer and let the caller decide
+        answer, winner = best_effort
+
+    with _stats_lock:
+        _hedge_stats["calls"] += 1
+        if hedged:
+            _hedge_stats["hedged"] += 1
+        if winner:
+            _hedge_stats[f"{winner}_wins"] += 1
+        else:
+            _hedge_stats["failures"] += 1
+        _hedged_call_latencies.append(time.perf_counter() - start)
+
+    if answer is None:
+        if last_error is not None:
+            raise last_error
+        return "", None
+    return answer, MODEL_NAME if winner == "primary" else FALLBACK_MODEL_NAME
+
+def generate_answer(
+    system_prompt: str,
+    user_prompt: str,
+    max_new_tokens: int = 2048,
+    hedge: bool = False,
+    cache: bool = False,
+    bypass_cache: bool = False,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> str:
+    # validate(answer) -> bool marks answers the caller can use (e.g. they parse as the JSON
+    # it expects); exceptions count as False. Hedged calls only let a valid answer win the
+    # race, and only valid answers are cached.
+    messages = build_prompt_structure(system_prompt, user_prompt)
+
+    if not cache:
+        return _generate_uncached(messages, max_new_tokens, hedge, validate)[0]
+
+    # Bypass skips the lookup but still refreshes the stored answer.
+    # Keyed by the primary model; fallback answers are returned but never stored under it.
+    cache_key = llm_cache.make_cache_key(
+        MODEL_NAME,
+        messages,
+        {"temperature": 0.3, "top_p": 0.9, "max_tokens": max_new_tokens},
+    )
+    if not (bypass_cache or llm_cache.CACHE_BYPASS):
+        cached = llm_cache.get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+    answer, model = _generate_uncached(messages, max_new_tokens, hedge, validate)
+    if answer and model == MODEL_NAME and _is_valid(answer, validate):
+        llm_cache.put_cached(cache_key, model, answer)
+    return answer
+
+def _is_valid(answer: str, validate: Optional[Callable[[str], bool]]) -> bool:
+    if validate is None:
+        return True
+    try:
+        return bool(validate(answer))
+    except Exception:
+        return False
+
+def _generate_uncached(
+    messages,
+    max_new_tokens: int,
+    hedge: bool,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> Tuple[str, Optional[str]]:
+    # Returns (answer, name of the model that produced it)
+    if hedge:
+        return _generate_hedged(messages, max_new_tokens, validate)
+
+    try:
+        start = time.perf_counter()
+        answer = _complete(get_llm(), MODEL_NAME, messages, max_new_tokens)
+        _record_primary_latency(time.perf_counter() - start)
+        return answer, MODEL_NAME
     except Exception as e:
         print(f"Primary model failed ({e}), switching to fallback...")
-        client = _get_fallback_llm()
-        response = client.chat.completions.create(
-            model=FALLBACK_MODEL_NAME,
-            messages=messages,
-            temperature=0.3,
-            max_tokens=max_new_tokens,
-            top_p=0.9,
-        )
-        msg = response.choices[0].message.content
-        return msg.strip() if msg else ""
-
+        return _complete(_get_fallback_llm(), FALLBACK_MODEL_NAME, messages, max_new_tokens), FALLBACK_MODEL_NAME
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Content-addressed cache for LLM responses, keyed by (model, messages, params).
+# Stored in a local SQLite file so it survives restarts and bulk rescoring runs.
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+CACHE_BYPASS = os.getenv("LLM_CACHE_BYPASS", "").lower() in ("1", "true", "yes")
+
+_conn = None
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size_bytes INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+            """
+        )
+        _conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_last_used ON llm_responses (last_used_at)")
+        # Running SUM(size_bytes), kept in the file so every process sharing it sees the same total;
+        # seeded once from the table for caches created before it existed
+        _conn.execute("CREATE TABLE IF NOT EXISTS llm_cache_meta (id INTEGER PRIMARY KEY CHECK (id = 1), total_bytes INTEGER NOT NULL)")
+        _conn.execute(
+            "INSERT OR IGNORE INTO llm_cache_meta (id, total_bytes) SELECT 1, COALESCE(SUM(size_bytes), 0) FROM llm_responses"
+        )
+        _conn.commit()
+    return _conn
+
+def make_cache_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def get_cached(cache_key: str) -> Optional[str]:
+    with _lock:
+        conn = _get_conn()
+        row = conn.execute(
+            "SELECT response FROM llm_responses WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        if row is None:
+            _stats["misses"] += 1
+            return None
+        conn.execute(
+            "UPDATE llm_responses SET last_used_at = ? WHERE cache_key = ?",
+            (time.time(), cache_key),
+        )
+        conn.commit()
+        _stats["hits"] += 1
+        return row[0]
+
+def put_cached(cache_key: str, model: str, response: str):
+    now = time.time()
+    size_bytes = len(response.encode("utf-8"))
+    with _lock:
+        conn = _get_conn()
+        conn.execute("BEGIN IMMEDIATE") # old size, replace and total update in one write transaction
+        old = conn.execute("SELECT size_bytes FROM llm_responses WHERE cache_key = ?", (cache_key,)).fetchone()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO llm_responses (cache_key, model, response, size_bytes, created_at, last_used_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (cache_key, model, response, size_bytes, now, now),
+        )
+        _add_total(conn, size_bytes - (old[0] if old else 0))
+        _stats["writes"] += 1
+        _evict(conn)
+        conn.commit()
+
+def _add_total(conn: sqlite3.Connection, delta: int):
+    conn.execute("UPDATE llm_cache_meta SET total_bytes = total_bytes + ? WHERE id = 1", (delta,))
+
+def _total_bytes(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT total_bytes FROM llm_cache_meta WHERE id = 1").fetchone()[0]
+
+def _evict(conn: sqlite3.Connection):
+    # Only sweeps when the running total is over budget
+    total = _total_bytes(conn)
+    if total <= CACHE_MAX_BYTES:
+        return
+
+    # Drop least recently used entries until we are back under 90% of the budget
+    target = int(CACHE_MAX_BYTES * 0.9)
+    rows = conn.execute("SELECT cache_key, size_bytes FROM llm_responses ORDER BY last_used_at ASC").fetchall()
+    to_delete = []
+    freed = 0
+    for cache_key, size_bytes in rows:
+        if total - freed <= target:
+            break
+        to_delete.append((cache_key,))
+        freed += size_bytes
+    conn.executemany("DELETE FROM llm_responses WHERE cache_key = ?", to_delete)
+    _add_total(conn, -freed)
+    _stats["evictions"] += len(to_delete)
+
+def clear_cache():
+    with _lock:
+        conn = _get_conn()
+        conn.execute("DELETE FROM llm_responses")
+        conn.execute("UPDATE llm_cache_meta SET total_bytes = 0 WHERE id = 1")
+        conn.commit()
+
+def get_cache_stats() -> Dict[str, Any]:
+    with _lock:
+        conn = _get_conn()
+        entries = conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+        size_bytes = _total_bytes(conn)
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    stats["entries"] = entries
+    stats["size_bytes"] = size_bytes
+    stats["max_bytes"] = CACHE_MAX_BYTES
+    return stats
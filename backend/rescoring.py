@@ -0,0 +1,187 @@
+import json
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from backend.ingestion import get_connection
+from backend.ats_batch import (
+    DEFAULT_CHUNK_SIZE,
+    SCORING_VERSION,
+    _column_type,
+    _parse_json,
+    refresh_requirement_skills,
+    register_vocabulary,
+    score_application_ids,
+)
+from backend.skills import SEMANTIC_SKILL_MATCHING, SKILLS_LIST, SKILLS_VERSION, requirement_skills
+
+# Incremental rescoring. Every scored application records the skill vocabulary,
+# scoring formula and JD requirements it was computed with:
+#   - scoring_version / requirements_hash mismatch -> rescore
+#   - skills_version mismatch -> rescore only if the vocabulary diff touches the job's
+#     requirements (skill -> job index on job_posts.requirement_skills, then
+#     job -> applications); otherwise the version is bumped in place.
+# Only skills a JD asks for affect a score, so a vocabulary change that misses a
+# job's requirements cannot change any of its applications' scores.
+
+def load_vocabulary(cursor, version: str) -> Optional[List[str]]:
+    cursor.execute("SELECT skills FROM skill_vocabularies WHERE version = %s", (version,))
+    row = cursor.fetchone()
+    return _parse_json(row[0]) if row else None
+
+def refresh_job_index(cursor) -> int:
+    # Bring requirement_skills / requirements_hash up to date for jobs scored with older versions
+    cursor.execute(
+        """
+        SELECT id, requirements
+        FROM job_posts
+        WHERE requirements IS NOT NULL
+          AND (requirement_skills_version IS DISTINCT FROM %s OR requirements_hash IS NULL)
+        """,
+        (SKILLS_VERSION,),
+    )
+    rows = cursor.fetchall()
+    refresh_requirement_skills(cursor, {str(job_id): _parse_json(req) for job_id, req in rows})
+    return len(rows)
+
+def _jobs_affected_by_vocabulary(cursor, old_version: str, old_skills: Sequence[str]) -> Set[str]:
+    removed = sorted(set(old_skills) - set(SKILLS_LIST))
+    added = [skill for skill in SKILLS_LIST if skill not in set(old_skills)]
+
+    affected: Set[str] = set()
+    if removed:
+        # GIN lookup for jobs indexed with the old vocabulary
+        cursor.execute(
+            "SELECT id FROM job_posts WHERE requirement_skills_version = %s AND requirement_skills && %s::text[]",
+            (old_version, removed),
+        )
+        affected.update(str(r[0]) for r in cursor.fetchall())
+
+    cursor.execute(
+        """
+        SELECT DISTINCT jp.id, jp.requirements, jp.requirement_skills_version
+        FROM job_posts jp
+        JOIN applications a ON a.job_post_id = jp.id
+        WHERE a.skills_version = %s
+        """,
+        (old_version,),
+    )
+    for job_id, requirements, index_version in cursor.fetchall():
+        jd_data = _parse_json(requirements) or {}
+        if removed and index_version != old_version and set(requirement_skills(jd_data, old_skills)) & set(removed):
+            affected.add(str(job_id))
+        elif added and requirement_skills(jd_data, added): # matcher built from the added skills only
+            affected.add(str(job_id))
+    return affected
+
+def find_outdated_applications(cursor) -> Set[str]:
+    # Formula, JD requirements or their extractor changed since scoring (run after refresh_job_index).
+    # Jobs with outdated requirements are re-extracted when their applications are rescored.
+    from backend.retrieval import JD_EXTRACTOR_VERSION
+
+    cursor.execute(
+        """
+        SELECT a.id
+        FROM applications a
+        JOIN job_posts jp ON jp.id = a.job_post_id
+        WHERE a.ats_score IS NOT NULL
+          AND (a.scoring_version IS DISTINCT FROM %s
+               OR a.requirements_hash IS DISTINCT FROM jp.requirements_hash
+               OR jp.requirements_version IS DISTINCT FROM %s)
+        """,
+        (SCORING_VERSION, JD_EXTRACTOR_VERSION),
+    )
+    return {str(r[0]) for r in cursor.fetchall()}
+
+def plan_vocabulary_changes(cursor) -> Tuple[Set[str], List[Tuple[str, List[str]]]]:
+    # Splits applications scored with an old vocabulary into affected (stale) ones and
+    # (old_version, affected_jobs) pairs whose remaining applications only need a version bump.
+    # Runs before refresh_job_index so the skill -> job index still reflects the old vocabulary.
+    cursor.execute(
+        """
+        SELECT DISTINCT skills_version
+        FROM applications
+        WHERE ats_score IS NOT NULL AND skills_version IS DISTINCT FROM %s
+        """,
+        (SKILLS_VERSION,),
+    )
+    stale: Set[str] = set()
+    bumps = []
+    for (old_version,) in cursor.fetchall():
+        old_skills = load_vocabulary(cursor, old_version) if old_version else None
+        if old_skills is None or SEMANTIC_SKILL_MATCHING:
+            # Unknown vocabulary, or embedding matches that don't decompose per skill: rescore all
+            cursor.execute(
+                "SELECT id FROM applications WHERE ats_score IS NOT NULL AND skills_version IS NOT DISTINCT FROM %s",
+                (old_version,),
+            )
+            stale.update(str(r[0]) for r in cursor.fetchall())
+            continue
+
+        affected_jobs = sorted(_jobs_affected_by_vocabulary(cursor, old_version, old_skills))
+        bumps.append((old_version, affected_jobs))
+        if affected_jobs:
+            id_type = _column_type(cursor, "job_posts", "id")
+            cursor.execute(
+                f"""
+                SELECT id FROM applications
+                WHERE ats_score IS NOT NULL AND skills_version = %s AND job_post_id = ANY(%s::{id_type}[])
+                """,
+                (old_version, affected_jobs),
+            )
+            stale.update(str(r[0]) for r in cursor.fetchall())
+
+    return stale, bumps
+
+def bump_skills_version(cursor, old_version: str, affected_jobs: Sequence[str]) -> int:
+    # Scores of applications outside the affected jobs are unchanged under the new vocabulary
+    id_type = _column_type(cursor, "job_posts", "id")
+    cursor.execute(
+        f"""
+        UPDATE applications
+        SET skills_version = %s
+        WHERE ats_score IS NOT NULL
+          AND skills_version = %s
+          AND NOT (job_post_id = ANY(%s::{id_type}[]))
+        """,
+        (SKILLS_VERSION, old_version, list(affected_jobs)),
+    )
+    return cursor.rowcount
+
+def rescore_stale(dry_run: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        register_vocabulary(cursor)
+        vocabulary_stale, bumps = plan_vocabulary_changes(cursor)
+        refreshed_jobs = refresh_job_index(cursor)
+        outdated = find_outdated_applications(cursor)
+        stale = sorted(vocabulary_stale | outdated)
+
+        report = {
+            "refreshed_jobs": refreshed_jobs,
+            "vocabulary_stale": len(vocabulary_stale),
+            "formula_or_jd_stale": len(outdated),
+            "stale": len(stale),
+            "bumped": 0,
+            "rescored": 0,
+        }
+        if dry_run:
+            conn.rollback()
+            print(json.dumps(report, indent=2))
+            return report
+
+        for old_version, affected_jobs in bumps:
+            report["bumped"] += bump_skills_version(cursor, old_version, affected_jobs)
+        conn.commit()
+
+    except Exception as e:
+        conn.rollback()
+        print(f"Error planning rescoring: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    print(f"{report['stale']} stale applications, {report['bumped']} kept with bumped skills_version.")
+    report["rescored"] = score_application_ids(stale, chunk_size=chunk_size)
+    return report
@@ -0,0 +1,215 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+import streamlit as st
+
+# Process-wide resources: embedding model, DB connection pool and LLM clients.
+# One ResourceRegistry per server process (st.cache_resource), shared by every
+# session and page; each resource is built lazily on first use, or up front by warmup().
+
+EMBEDDING_MODEL_NAME = "BAAI/bge-base-en-v1.5"
+DB_POOL_MIN = int(os.getenv("DB_POOL_MIN", "1"))
+DB_POOL_MAX = int(os.getenv("DB_POOL_MAX", "10"))
+# How long get_connection() waits for a free pooled connection before raising
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+
+def _connect_kwargs() -> Dict[str, Any]:
+    return {
+        "host": st.secrets["DB_HOST"],
+        "port": int(st.secrets["DB_PORT"]),
+        "dbname": st.secrets["DB_NAME"],
+        "user": st.secrets["DB_USER"],
+        "password": st.secrets["DB_PASSWORD"],
+        "sslmode": "require",
+    }
+
+def _rss_bytes() -> int:
+    # Current resident memory of this process (Linux /proc), falling back to peak RSS
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+class PooledConnection:
+    # Wraps a pooled psycopg2 connection; close() hands it back to the pool instead of
+    # closing the socket, so existing get_connection() / conn.close() call sites stay unchanged.
+
+    def __init__(self, registry: "ResourceRegistry", pool: ThreadedConnectionPool, conn):
+        object.__setattr__(self, "_registry", registry)
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already returned to the pool")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        # Same as psycopg2: the with-block is a transaction (commit/rollback), not a close
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return self._conn.__exit__(exc_type, exc, tb)
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        self._registry._release(self._pool, conn)
+
+    def __del__(self):
+        # Not released here: a cursor taken from a dropped proxy may still be in use.
+        # The slot stays checked out, so the leak shows up in report()["pool_checked_out"].
+        if object.__getattribute__(self, "_conn") is not None:
+            print("Warning: pooled database connection garbage-collected without close(); it stays checked out.")
+
+class ResourceRegistry:
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._resources: Dict[str, Any] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._pool = None
+        # Blocks callers while all DB_POOL_MAX connections are checked out (the pool itself would raise)
+        self._pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+        self._checked_out = 0
+        self.created_at = time.time()
+        self.warmup_seconds = None
+
+    def get(self, name: str, factory: Callable[[], Any]) -> Any:
+        # Shared instance for name, built once by factory
+        resource = self._resources.get(name)
+        if resource is not None:
+            return resource
+        with self._lock:
+            if name not in self._resources:
+                started = time.perf_counter()
+                self._resources[name] = factory()
+                self._load_seconds[name] = time.perf_counter() - started
+            return self._resources[name]
+
+    def embedding_model(self):
+        def load():
+            from sentence_transformers import SentenceTransformer
+            return SentenceTransformer(EMBEDDING_MODEL_NAME)
+        return self.get("embedding_model", load)
+
+    def connection_pool(self) -> ThreadedConnectionPool:
+        def connect():
+            return ThreadedConnectionPool(DB_POOL_MIN, DB_POOL_MAX, **_connect_kwargs())
+        self._pool = self.get("db_pool", connect)
+        return self._pool
+
+    def get_connection(self, timeout: Optional[float] = None) -> PooledConnection:
+        # Callers pass their open cursor down instead of nesting checkouts; the timeout turns
+        # any remaining nesting under load into an error rather than a process-wide hang.
+        # timeout overrides DB_POOL_TIMEOUT_SECONDS (best-effort callers use a short one).
+        timeout = DB_POOL_TIMEOUT_SECONDS if timeout is None else timeout
+        pool = self.connection_pool()
+        if not self._pool_slots.acquire(timeout=timeout):
+            raise PoolError(
+                f"no database connection free after {timeout:.0f}s "
+                f"({self._checked_out}/{DB_POOL_MAX} checked out)"
+            )
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                # Server dropped it while idle in the pool
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+        except Exception:
+            self._pool_slots.release()
+            raise
+        with self._lock:
+            self._checked_out += 1
+        return PooledConnection(self, pool, conn)
+
+    def _release(self, pool: ThreadedConnectionPool, conn):
+        try:
+            broken = bool(conn.closed)
+            if not broken:
+                try:
+                    conn.rollback() # don't hand an open transaction to the next caller
+                    if conn.autocommit:
+                        conn.autocommit = False
+                except psycopg2.Error:
+                    broken = True
+            pool.putconn(conn, close=broken)
+        finally:
+            with self._lock:
+                self._checked_out -= 1
+            self._pool_slots.release()
+
+    def warmup(self) -> Dict[str, float]:
+        # Builds every resource now instead of on the first user request
+        from backend.llm import _get_fallback_llm, get_llm
+
+        started = time.perf_counter()
+        model = self.embedding_model()
+        model.encode(["warmup"], normalize_embeddings=True) # first encode initialises kernels
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+        finally:
+            conn.close()
+        get_llm()
+        _get_fallback_llm()
+        self.warmup_seconds = time.perf_counter() - started
+        return dict(self._load_seconds)
+
+    def probe_latency(self) -> Dict[str, float]:
+        # Round trips on already-built resources, in milliseconds
+        latencies = {}
+        if "embedding_model" in self._resources:
+            started = time.perf_counter()
+            self._resources["embedding_model"].encode(["latency probe"], normalize_embeddings=True)
+            latencies["embed_query_ms"] = (time.perf_counter() - started) * 1000
+        if "db_pool" in self._resources:
+            started = time.perf_counter()
+            conn = self.get_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+                cursor.close()
+            finally:
+                conn.close()
+            latencies["db_round_trip_ms"] = (time.perf_counter() - started) * 1000
+        return latencies
+
+    def report(self) -> Dict[str, Any]:
+        model_bytes = None
+        model = self._resources.get("embedding_model")
+        if model is not None:
+            model_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+        return {
+            "loaded": sorted(self._resources),
+            "load_seconds": dict(self._load_seconds),
+            "warmup_seconds": self.warmup_seconds,
+            "uptime_seconds": time.time() - self.created_at,
+            "rss_bytes": _rss_bytes(),
+            "embedding_model_bytes": model_bytes,
+            "pool_max": DB_POOL_MAX,
+            "pool_checked_out": self._checked_out,
+        }
+
+@st.cache_resource
+def get_registry() -> ResourceRegistry:
+    return ResourceRegistry()
+
+def warmup() -> Dict[str, float]:
+    return get_registry().warmup()
@@ -1,4 +1,3 @@
-from sentence_transformers import SentenceTransformer
 from backend.ingestion import get_connection
 import numpy, math
 
@@ -6,19 +5,24 @@ from typing import Tuple, List, Any, Optional, Dict
 import json
 from backend.llm import generate_answer
 
-embedding_model = SentenceTransformer("BAAI/bge-base-en-v1.5")
+def get_embedding_model():
+    # Loaded once per process by the resource registry, on first use
+    from backend.resources import get_registry
+    return get_registry().embedding_model()
 
 RowType = Tuple[int, str, str, float, float]
 
-def get_resume_sections(cursor):
-    cursor.execute(
-        """
+def get_resume_sections(cursor, document_id=None):
+    sql = """
         SELECT id, content
         FROM document_sections
         WHERE embedding IS NULL
-        ORDER BY section_index;
-        """
-    )
+    """
+    params = ()
+    if document_id is not None:
+        sql += " AND document_id = %s"
+        params = (document_id,)
+    cursor.execute(sql + " ORDER BY section_index;", params)
     
     rows = cursor.fetchall()
     
@@ -33,7 +37,7 @@ def get_resume_sections(cursor):
     return sections
 
 def generate_embedding(text: str): #generate vector embeddings
-    embedding = embedding_model.encode(
+    embedding = get_embedding_model().encode(
         text,
         normalize_embeddings = True
     )
@@ -51,90 +55,151 @@ def update_resume_sections(cursor, section_id, embedding):
         (embedding_str, section_id),
     )
     
-def embed_resume_sections(cursor):
-    sections = get_resume_sections(cursor)
+def embed_resume_sections(cursor, document_id=None):
+    # document_id limits embedding to one document's sections (used by ingestion)
+    sections = get_resume_sections(cursor, document_id)
     print("Found", len(sections), "sections to embed.")
-    
-    for section in sections:
+    if not sections:
+        return 0
+
+    # One batched encode for all sections
+    embeddings = get_embedding_model().encode(
+        [section["content"] for section in sections],
+        normalize_embeddings = True
+    )
+    for section, emb in zip(sections, embeddings):
         print("Embeddings section:", section["id"])
-        emb = generate_embedding(section["content"])
         update_resume_sections(cursor, section["id"], emb)
         
     print ("Embedding completed.")
+    return len(sections)
     
 def embed_query(text):
     vec = generate_embedding(text)
     return vec
 
-def extract_jd_requirements(jd_text: str) -> Dict[str, List[str]]:
-    
+def request_jd_requirements(jd_text: str, bypass_cache: bool = False) -> Dict[str, List[str]]:
+    # Raises on LLM/parse errors so batch extraction can leave the job unextracted for a retry
     system_prompt = (
         "You are an expert technical recruiter. Extract skills and requirements from the Job Description."
         "Return ONLY a JSON object with keys: 'must_have' (list of strings) and 'nice_to_have' (list of strings)."
         "No markdown formatting, just raw JSON."
     )
     user_prompt = f"Job Description:\n{jd_text}"
-    
+
+    response = generate_answer(
+        system_prompt, user_prompt, cache=True, bypass_cache=bypass_cache,
+        validate=lambda r: validate_jd_requirements(parse_llm_json(r)) is not None,
+    )
+    validated = validate_jd_requirements(parse_llm_json(response))
+    if validated is None:
+        raise ValueError("JD requirements JSON is missing 'must_have'/'nice_to_have' lists")
+    return validated
+
+def extract_jd_requirements(jd_text: str, bypass_cache: bool = False) -> Dict[str, List[str]]:
     try:
-        response = generate_answer(system_prompt, user_prompt)
-        response = response.replace("```json", "").replace("```", "").strip()
-        data = json.loads(response)
-        return data
+        return request_jd_requirements(jd_text, bypass_cache)
     except Exception as e:
         print(f"Error extracting JD requirements: {e}")
         return {"must_have": [], "nice_to_have": []}
 
+JD_BATCH_SIZE = 5 # JDs packed into one extraction request
+JD_EXTRACTOR_VERSION = "1" # bump when the extraction prompts change to trigger re-extraction
+
+def parse_llm_json(response: str) -> Any:
+    return json.loads(response.replace("```json", "").replace("```", "").strip())
+
+def validate_jd_requirements(data: Any) -> Optional[Dict[str, List[str]]]:
+    if not isinstance(data, dict):
+        return None
+
+    validated = {}
+    for key in ("must_have", "nice_to_have"):
+        values = data.get(key)
+        if not isinstance(values, list) or not all(isinstance(v, str) for v in values):
+            return None
+        validated[key] = [v.strip() for v in values if v.strip()]
+    return validated
+
+def _extract_jd_requirements_packed(jobs: Dict[str, str], bypass_cache: bool = False) -> Dict[str, Any]:
+    system_prompt = (
+        "You are an expert technical recruiter. Extract skills and requirements from EACH Job Description below."
+        "Return ONLY a JSON object keyed by job id. Each value must be a JSON object with keys: "
+        "'must_have' (list of strings) and 'nice_to_have' (list of strings)."
+        "Include every job id exactly once. No markdown formatting, just raw JSON."
+    )
+    blocks = [f"Job ID: {job_id}\nJob Description:\n{jd_text}" for job_id, jd_text in jobs.items()]
+    user_prompt = "\n\n---\n\n".join(blocks)
+
+    def complete(response: str) -> bool:
+        # Only answers with a valid entry for every job are cached
+        data = parse_llm_json(response)
+        return isinstance(data, dict) and all(validate_jd_requirements(data.get(job_id)) is not None for job_id in jobs)
+
+    response = generate_answer(system_prompt, user_prompt, cache=True, bypass_cache=bypass_cache, validate=complete)
+    data = parse_llm_json(response)
+    return data if isinstance(data, dict) else {}
+
+def extract_jd_requirements_batch(
+    jobs: Dict[str, str],
+    batch_size: int = JD_BATCH_SIZE,
+    max_retries: int = 2,
+    bypass_cache: bool = False,
+) -> Dict[str, Dict[str, List[str]]]:
+    # jobs: job_post_id -> raw JD text. Only items that fail validation are retried.
+    # bypass_cache=True skips cached answers on every attempt (forced re-extraction).
+    # Jobs that still fail are left out of the result (and reported), so callers never
+    # persist an empty placeholder as if it were the extraction.
+    results: Dict[str, Dict[str, List[str]]] = {}
+    pending = {str(job_id): text for job_id, text in jobs.items()}
+
+    for attempt in range(max_retries + 1):
+        if not pending:
+            break
+
+        job_ids = list(pending.keys())
+        failed = {}
+        for start in range(0, len(job_ids), batch_size):
+            chunk = {job_id: pending[job_id] for job_id in job_ids[start:start + batch_size]}
+            try:
+                # A retry skips the cache in case the stored answer was the bad one
+                data = _extract_jd_requirements_packed(chunk, bypass_cache=bypass_cache or attempt > 0)
+            except Exception as e:
+                print(f"Error extracting batch of {len(chunk)} JDs (attempt {attempt + 1}): {e}")
+                data = {}
+
+            for job_id, jd_text in chunk.items():
+                validated = validate_jd_requirements(data.get(job_id))
+                if validated is None:
+                    failed[job_id] = jd_text
+                else:
+                    results[job_id] = validated
+
+        if failed:
+            print(f"{len(failed)} JDs failed validation, retrying...")
+        pending = failed
+
+    # Last resort: one request per JD
+    failed = []
+    for job_id, jd_text in pending.items():
+        try:
+            results[job_id] = request_jd_requirements(jd_text, bypass_cache=bypass_cache)
+        except Exception as e:
+            print(f"Error extracting requirements for job {job_id}: {e}")
+            failed.append(job_id)
+
+    if failed:
+        print(f"Requirement extraction failed for {len(failed)} job(s), left for a later retry: {failed}")
+    return results
+
 import re
 
-SKILLS_LIST = [
-    # Programming Languages
-    "python", "r", "sql", "java", "c++", "scala", "julia", "matlab", "sas",
-    
-    # Data Manipulation & Analysis
-    "pandas", "numpy", "scipy", "dask", "polars", "vaex", "modin", 
-    
-    # Visualization
-    "matplotlib", "seaborn", "plotly", "bokeh", "altair", "ggplot", "tableau", "power bi", "looker", "quicksight",
-    
-    # Machine Learning & Statistics
-    "scikit-learn", "xgboost", "lightgbm", "catboost", "statsmodels", "h2o", "auto-sklearn", "tpot",
-    "regression", "classification", "clustering", "time series", "forecasting", "a/b testing", "hypothesis testing",
-    
-    # Deep Learning (Frameworks & Architectures)
-    "pytorch", "tensorflow", "keras", "mxnet", "jax", "fastai", "opencv",
-    "cnn", "rnn", "lstm", "gan", "transformer", "bert", "gpt", "diffusion models",
-    
-    # NLP & LLM
-    "nltk", "spacy", "gensim", "textblob", "hugging face", "transformers", "langchain", "llamaindex", 
-    "haystack", "openai api", "anthropic", "gemini", "llama", "mistral", "rag", "retrieval augmented generation",
-    "prompt engineering", "fine-tuning", "lora", "qlora",
-    
-    # Vector Databases & Search
-    "vector database", "pgvector", "pinecone", "faiss", "weaviate", "chromadb", "milvus", "qdrant", "elasticsearch", "opensearch",
-    
-    # Big Data & Distributed Computing
-    "spark", "pyspark", "hadoop", "hive", "kafka", "flink", "databricks", "snowflake", "bigquery", "redshift",
-    
-    # MLOps & Model Serving
-    "mlflow", "kubeflow", "airflow", "prefect", "dbt", "wandb", "weights & biases", "bentoml", "ray", 
-    "sagemaker", "vertex ai", "azure ml", "docker", "kubernetes", "git", "ci/cd",
-    
-    # Databases (SQL & NoSQL)
-    "postgresql", "mysql", "mongodb", "cassandra", "redis", "dynamodb", "oracle", "sql server",
-    
-    # Cloud Platforms
-    "aws", "gcp", "azure", "ibm cloud", "oracle cloud"
-]
+from backend.skills import SKILLS_LIST, extract_skills
 
 def extract_resume_entities(resume_text: str) -> Dict[str, Any]:
     # 1. Extract Skills (Keyword Matching)
     text_lower = resume_text.lower()
-    found_skills = []
-    
-    for skill in SKILLS_LIST:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.append(skill)
+    found_skills = extract_skills(text_lower)
             
     # 2. Extract Years of Experience
     years_pattern = r'(\d+)\+?\s*(?:years?|yrs?)'
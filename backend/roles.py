@@ -0,0 +1,102 @@
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.ingestion import get_connection
+
+# Role families group job posts whose titles differ only in seniority, level or
+# spelling ("Senior Data Scientist II", "data scientist") so per-role analytics
+# can filter on an indexed job_posts.role_family_id instead of ILIKE patterns.
+
+_SENIORITY_WORDS = {
+    "junior", "jr", "senior", "sr", "lead", "principal", "staff",
+    "intern", "internship", "trainee", "graduate", "associate", "mid", "level", "entry",
+}
+_LEVEL_RE = re.compile(r"^(?:i{1,3}|iv|v|l?\d+)$")
+_TITLE_ABBREVIATIONS = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "dev": "developer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "mgr": "manager",
+    "bi": "business intelligence",
+    "qa": "quality assurance",
+}
+
+def normalize_role_family(role_title: str) -> str:
+    words = re.sub(r"[^a-z0-9+#]+", " ", (role_title or "").lower()).split()
+    kept = []
+    for word in words:
+        if word in _SENIORITY_WORDS or _LEVEL_RE.match(word):
+            continue
+        kept.append(_TITLE_ABBREVIATIONS.get(word, word))
+    return " ".join(kept) or (role_title or "").strip().lower()
+
+def get_or_create_role_family(cursor, role_title: str) -> int:
+    name = normalize_role_family(role_title)
+    cursor.execute(
+        """
+        INSERT INTO role_families (name) VALUES (%s)
+        ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+        RETURNING id;
+        """,
+        (name,),
+    )
+    return cursor.fetchone()[0]
+
+def role_job_filter(role_pattern: Optional[str] = None, role_family_id: Optional[int] = None) -> Tuple[str, List[Any]]:
+    # SQL condition on job_posts alias "jp": exact family (btree) or ad-hoc ILIKE pattern (trigram GIN).
+    # Neither given means every job.
+    if role_family_id is not None:
+        return "jp.role_family_id = %s", [role_family_id]
+    if role_pattern is not None:
+        return "jp.role_title ILIKE %s", [role_pattern]
+    return "TRUE", []
+
+def get_role_families() -> List[Dict[str, Any]]:
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            """
+            SELECT rf.id, rf.name, COUNT(jp.id) AS job_count
+            FROM role_families rf
+            LEFT JOIN job_posts jp ON jp.role_family_id = rf.id
+            GROUP BY rf.id, rf.name
+            ORDER BY rf.name;
+            """
+        )
+        return [{"id": r[0], "name": r[1], "job_count": r[2]} for r in cursor.fetchall()]
+
+    finally:
+        cursor.close()
+        conn.close()
+
+def backfill_role_families() -> int:
+    # Assigns families to job posts created before role_family_id existed
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT id, role_title FROM job_posts WHERE role_family_id IS NULL")
+        rows = cursor.fetchall()
+        for job_post_id, role_title in rows:
+            cursor.execute(
+                "UPDATE job_posts SET role_family_id = %s WHERE id = %s",
+                (get_or_create_role_family(cursor, role_title), job_post_id),
+            )
+        conn.commit()
+        print(f"Assigned role families to {len(rows)} job posts.")
+        return len(rows)
+
+    except Exception as e:
+        conn.rollback()
+        print("Error backfilling role families:", e)
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,424 @@
+from backend.ingestion import get_connection
+
+# Idempotent DDL for columns/tables the backend relies on beyond the base
+# Supabase schema. Run with: python -m backend.schema
+SCHEMA_STATEMENTS = [
+    # Scoring worker claims (lease-based, see backend.ats_batch.run_scoring_worker)
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS claimed_by TEXT",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ",
+    """
+    CREATE INDEX IF NOT EXISTS idx_applications_pending
+    ON applications (id)
+    WHERE status = 'new' OR ats_score IS NULL
+    """,
+    # One application per (job, resume). Before the constraint exists, duplicate pairs are
+    # collapsed to the most useful row: scored first, then past 'new', then most recently updated.
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_constraint WHERE conname = 'applications_job_resume_key'
+        ) THEN
+            DELETE FROM applications a
+            USING (
+                SELECT ctid, ROW_NUMBER() OVER (
+                    PARTITION BY job_post_id, resume_document_id
+                    ORDER BY ats_score IS NOT NULL DESC,
+                             COALESCE(status, 'new') <> 'new' DESC,
+                             updated_at DESC NULLS LAST,
+                             created_at DESC NULLS LAST
+                ) AS rn
+                FROM applications
+            ) ranked
+            WHERE a.ctid = ranked.ctid
+              AND ranked.rn > 1;
+
+            ALTER TABLE applications
+            ADD CONSTRAINT applications_job_resume_key UNIQUE (job_post_id, resume_document_id);
+        END IF;
+    END $$
+    """,
+    # Which extractor produced job_posts.requirements (see retrieval.JD_EXTRACTOR_VERSION)
+    "ALTER TABLE job_posts ADD COLUMN IF NOT EXISTS requirements_version TEXT",
+    # Versions each score was computed with (see backend.rescoring)
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS skills_version TEXT",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS scoring_version TEXT",
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS requirements_hash TEXT",
+    "ALTER TABLE job_posts ADD COLUMN IF NOT EXISTS requirements_hash TEXT",
+    "CREATE INDEX IF NOT EXISTS idx_applications_job_post ON applications (job_post_id)",
+    # Skill -> job index: which vocabulary skills each JD asks for
+    "ALTER TABLE job_posts ADD COLUMN IF NOT EXISTS requirement_skills TEXT[]",
+    "ALTER TABLE job_posts ADD COLUMN IF NOT EXISTS requirement_skills_version TEXT",
+    "CREATE INDEX IF NOT EXISTS idx_job_posts_requirement_skills ON job_posts USING GIN (requirement_skills)",
+    # Snapshot of every skill vocabulary we scored with, to diff against the current one
+    """
+    CREATE TABLE IF NOT EXISTS skill_vocabularies (
+        version TEXT PRIMARY KEY,
+        skills JSONB NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    # Incrementally maintained application counts/score sums per (job, status), read by backend.analytics.
+    # Statement-level triggers fold each write's transition tables into per-key deltas, so set-based
+    # scoring UPDATEs touch each summary row once; updates that change nothing relevant net to zero.
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('application_summary') IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE application_summary (
+                    job_post_id %s NOT NULL,
+                    status TEXT NOT NULL,
+                    app_count BIGINT NOT NULL DEFAULT 0,
+                    scored_count BIGINT NOT NULL DEFAULT 0,
+                    score_sum NUMERIC NOT NULL DEFAULT 0,
+                    PRIMARY KEY (job_post_id, status)
+                )',
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'job_posts'::regclass AND attname = 'id')
+            );
+        END IF;
+    END $$
+    """,
+    """
+    -- Upsert sources are ordered by key so concurrent set-based writers lock summary rows
+    -- in the same order and cannot deadlock on them
+    CREATE OR REPLACE FUNCTION application_summary_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO application_summary AS s (job_post_id, status, app_count, scored_count, score_sum)
+            SELECT job_post_id, COALESCE(status, 'unknown'), COUNT(*), COUNT(ats_score), COALESCE(SUM(ats_score), 0)
+            FROM new_rows
+            GROUP BY 1, 2
+            ORDER BY 1, 2
+            ON CONFLICT (job_post_id, status) DO UPDATE SET
+                app_count = s.app_count + EXCLUDED.app_count,
+                scored_count = s.scored_count + EXCLUDED.scored_count,
+                score_sum = s.score_sum + EXCLUDED.score_sum;
+        ELSIF TG_OP = 'DELETE' THEN
+            -- UPDATE ... FROM locks in join order; take the row locks in key order first
+            PERFORM 1
+            FROM application_summary s
+            WHERE (s.job_post_id, s.status) IN (SELECT job_post_id, COALESCE(status, 'unknown') FROM old_rows)
+            ORDER BY s.job_post_id, s.status
+            FOR UPDATE;
+            UPDATE application_summary AS s SET
+                app_count = s.app_count - d.app_count,
+                scored_count = s.scored_count - d.scored_count,
+                score_sum = s.score_sum - d.score_sum
+            FROM (
+                SELECT job_post_id, COALESCE(status, 'unknown') AS status,
+                       COUNT(*) AS app_count, COUNT(ats_score) AS scored_count, COALESCE(SUM(ats_score), 0) AS score_sum
+                FROM old_rows
+                GROUP BY 1, 2
+            ) d
+            WHERE s.job_post_id = d.job_post_id AND s.status = d.status;
+        ELSE
+            INSERT INTO application_summary AS s (job_post_id, status, app_count, scored_count, score_sum)
+            SELECT job_post_id, status, SUM(app_count), SUM(scored_count), SUM(score_sum)
+            FROM (
+                SELECT job_post_id, COALESCE(status, 'unknown') AS status,
+                       1 AS app_count, (ats_score IS NOT NULL)::int AS scored_count, COALESCE(ats_score, 0) AS score_sum
+                FROM new_rows
+                UNION ALL
+                SELECT job_post_id, COALESCE(status, 'unknown'),
+                       -1, -((ats_score IS NOT NULL)::int), -COALESCE(ats_score, 0)
+                FROM old_rows
+            ) d
+            GROUP BY 1, 2
+            HAVING SUM(app_count) <> 0 OR SUM(scored_count) <> 0 OR SUM(score_sum) <> 0
+            ORDER BY 1, 2
+            ON CONFLICT (job_post_id, status) DO UPDATE SET
+                app_count = s.app_count + EXCLUDED.app_count,
+                scored_count = s.scored_count + EXCLUDED.scored_count,
+                score_sum = s.score_sum + EXCLUDED.score_sum;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS application_summary_insert ON applications",
+    "DROP TRIGGER IF EXISTS application_summary_update ON applications",
+    "DROP TRIGGER IF EXISTS application_summary_delete ON applications",
+    """
+    CREATE TRIGGER application_summary_insert AFTER INSERT ON applications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION application_summary_apply()
+    """,
+    """
+    CREATE TRIGGER application_summary_update AFTER UPDATE ON applications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION application_summary_apply()
+    """,
+    """
+    CREATE TRIGGER application_summary_delete AFTER DELETE ON applications
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION application_summary_apply()
+    """,
+    # Seed from the live table the first time (later drift is fixed by analytics.check_application_summary)
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM application_summary) THEN
+            INSERT INTO application_summary (job_post_id, status, app_count, scored_count, score_sum)
+            SELECT job_post_id, COALESCE(status, 'unknown'), COUNT(*), COUNT(ats_score), COALESCE(SUM(ats_score), 0)
+            FROM applications
+            GROUP BY 1, 2;
+        END IF;
+    END $$
+    """,
+    # Change counter for the dashboard snapshot cache (backend.analytics.get_dashboard_snapshot).
+    # A sequence never blocks concurrent writers; a bump from a rolled-back write only costs a refresh.
+    # Statement-level triggers bump once per statement, however many rows it touches. Application
+    # updates only bump when a column the dashboard reads changes, so worker claims don't.
+    # A reader that builds between the bump and the writer's commit serves pre-commit data for at
+    # most DASHBOARD_MAX_AGE_SECONDS.
+    "CREATE SEQUENCE IF NOT EXISTS dashboard_change_seq",
+    """
+    CREATE OR REPLACE FUNCTION dashboard_change_bump() RETURNS trigger AS $$
+    BEGIN
+        PERFORM nextval('dashboard_change_seq');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS dashboard_change_applications ON applications",
+    "DROP TRIGGER IF EXISTS dashboard_change_applications_update ON applications",
+    "DROP TRIGGER IF EXISTS dashboard_change_job_posts ON job_posts",
+    "DROP TRIGGER IF EXISTS dashboard_change_documents ON documents",
+    """
+    CREATE TRIGGER dashboard_change_applications AFTER INSERT OR DELETE OR TRUNCATE ON applications
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_change_bump()
+    """,
+    """
+    CREATE TRIGGER dashboard_change_applications_update AFTER UPDATE OF job_post_id, status, ats_score ON applications
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_change_bump()
+    """,
+    """
+    CREATE TRIGGER dashboard_change_job_posts AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON job_posts
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_change_bump()
+    """,
+    """
+    CREATE TRIGGER dashboard_change_documents AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON documents
+    FOR EACH STATEMENT EXECUTE FUNCTION dashboard_change_bump()
+    """,
+    # Normalized skill outcomes per application, written at scoring time (see ats_batch.write_application_skills)
+    """
+    CREATE TABLE IF NOT EXISTS skills (
+        id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('application_skills') IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE application_skills (
+                    application_id %s NOT NULL REFERENCES applications (id) ON DELETE CASCADE,
+                    job_post_id %s NOT NULL,
+                    skill_id INTEGER NOT NULL REFERENCES skills (id),
+                    kind TEXT NOT NULL CHECK (kind IN (''matched_must'', ''missing_must'', ''matched_nice'', ''missing_nice'')),
+                    PRIMARY KEY (application_id, kind, skill_id)
+                )',
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'applications'::regclass AND attname = 'id'),
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'job_posts'::regclass AND attname = 'id')
+            );
+        END IF;
+    END $$
+    """,
+    # Top-N gaps per job: index-only scan of one (job, kind) range
+    "CREATE INDEX IF NOT EXISTS idx_application_skills_job_kind ON application_skills (job_post_id, kind, skill_id)",
+    # Role families (see backend.roles): exact per-role lookups by FK, trigram index for ad-hoc ILIKE patterns
+    """
+    CREATE TABLE IF NOT EXISTS role_families (
+        id SERIAL PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    )
+    """,
+    "ALTER TABLE job_posts ADD COLUMN IF NOT EXISTS role_family_id INTEGER REFERENCES role_families (id)",
+    "CREATE INDEX IF NOT EXISTS idx_job_posts_role_family ON job_posts (role_family_id)",
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_job_posts_role_title_trgm ON job_posts USING GIN (role_title gin_trgm_ops)",
+    # Candidate listing keyset: (-score, created_at, id) is all-ascending so row comparison can seek the index;
+    # INCLUDE covers the listed columns apart from the resume title
+    """
+    CREATE INDEX IF NOT EXISTS idx_applications_job_rank
+    ON applications (job_post_id, (-COALESCE(ats_score, -1)), created_at, id)
+    INCLUDE (status, ats_score, resume_document_id)
+    """,
+    # Append-only status history. Existing rows keep status_changed_at NULL (created_at is used instead).
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS status_changed_at TIMESTAMPTZ",
+    "ALTER TABLE applications ALTER COLUMN status_changed_at SET DEFAULT NOW()",
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('application_status_events') IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE application_status_events (
+                    id BIGSERIAL PRIMARY KEY,
+                    application_id %s NOT NULL,
+                    job_post_id %s NOT NULL,
+                    from_status TEXT,
+                    to_status TEXT NOT NULL,
+                    seconds_in_previous DOUBLE PRECISION,
+                    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+                )',
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'applications'::regclass AND attname = 'id'),
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'job_posts'::regclass AND attname = 'id')
+            );
+        END IF;
+    END $$
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_status_events_application ON application_status_events (application_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_status_events_job ON application_status_events (job_post_id, created_at)",
+    # Funnel / time-in-stage aggregate per (job, from_status, to_status); from_status 'created' = application created
+    """
+    DO $$
+    BEGIN
+        IF to_regclass('application_funnel_summary') IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE application_funnel_summary (
+                    job_post_id %s NOT NULL,
+                    from_status TEXT NOT NULL,
+                    to_status TEXT NOT NULL,
+                    transitions BIGINT NOT NULL DEFAULT 0,
+                    timed_transitions BIGINT NOT NULL DEFAULT 0,
+                    total_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    PRIMARY KEY (job_post_id, from_status, to_status)
+                )',
+                (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+                 WHERE attrelid = 'job_posts'::regclass AND attname = 'id')
+            );
+        END IF;
+    END $$
+    """,
+    """
+    CREATE OR REPLACE FUNCTION application_funnel_apply() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO application_funnel_summary AS s
+            (job_post_id, from_status, to_status, transitions, timed_transitions, total_seconds)
+        SELECT job_post_id, COALESCE(from_status, 'created'), to_status,
+               COUNT(*), COUNT(seconds_in_previous), COALESCE(SUM(seconds_in_previous), 0)
+        FROM new_events
+        GROUP BY 1, 2, 3
+        ORDER BY 1, 2, 3 -- deterministic lock order for concurrent status updates
+        ON CONFLICT (job_post_id, from_status, to_status) DO UPDATE SET
+            transitions = s.transitions + EXCLUDED.transitions,
+            timed_transitions = s.timed_transitions + EXCLUDED.timed_transitions,
+            total_seconds = s.total_seconds + EXCLUDED.total_seconds;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS application_funnel_insert ON application_status_events",
+    """
+    CREATE TRIGGER application_funnel_insert AFTER INSERT ON application_status_events
+    REFERENCING NEW TABLE AS new_events
+    FOR EACH STATEMENT EXECUTE FUNCTION application_funnel_apply()
+    """,
+    # Stamp the time a row entered its current status
+    """
+    CREATE OR REPLACE FUNCTION application_status_touch() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.status IS DISTINCT FROM OLD.status THEN
+            NEW.status_changed_at := NOW();
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS application_status_touch ON applications",
+    """
+    CREATE TRIGGER application_status_touch BEFORE UPDATE OF status ON applications
+    FOR EACH ROW EXECUTE FUNCTION application_status_touch()
+    """,
+    # One event per created application and per status change, whichever code path wrote it
+    """
+    CREATE OR REPLACE FUNCTION application_status_log() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO application_status_events (application_id, job_post_id, from_status, to_status)
+            SELECT id, job_post_id, NULL, COALESCE(status, 'unknown')
+            FROM new_rows;
+        ELSE
+            INSERT INTO application_status_events
+                (application_id, job_post_id, from_status, to_status, seconds_in_previous)
+            SELECT n.id, n.job_post_id, COALESCE(o.status, 'unknown'), COALESCE(n.status, 'unknown'),
+                   EXTRACT(EPOCH FROM NOW() - COALESCE(o.status_changed_at, o.created_at))
+            FROM new_rows n
+            JOIN old_rows o ON o.id = n.id
+            WHERE n.status IS DISTINCT FROM o.status;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS application_status_log_insert ON applications",
+    "DROP TRIGGER IF EXISTS application_status_log_update ON applications",
+    """
+    CREATE TRIGGER application_status_log_insert AFTER INSERT ON applications
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION application_status_log()
+    """,
+    """
+    CREATE TRIGGER application_status_log_update AFTER UPDATE ON applications
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION application_status_log()
+    """,
+    # Seed history for applications that predate the log: one creation event in their current status
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM application_status_events) THEN
+            INSERT INTO application_status_events (application_id, job_post_id, from_status, to_status, created_at)
+            SELECT id, job_post_id, NULL, COALESCE(status, 'unknown'), COALESCE(created_at, NOW())
+            FROM applications;
+        END IF;
+    END $$
+    """,
+    # Document picker search (ingestion.search_documents): trigram for prefix/substring/similarity,
+    # btree for browsing by type in title order
+    "CREATE INDEX IF NOT EXISTS idx_documents_title_trgm ON documents USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_documents_type_title ON documents (doc_type, title, id)",
+    # Learned phrase -> skill matches of backend.skill_normalizer, shared by every process.
+    # Keyed by vocabulary and embedding model; the similarity is kept so the threshold can change.
+    """
+    CREATE TABLE IF NOT EXISTS skill_aliases (
+        skills_version TEXT NOT NULL,
+        model_name TEXT NOT NULL,
+        phrase TEXT NOT NULL,
+        skill TEXT,
+        similarity REAL NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (skills_version, model_name, phrase)
+    )
+    """,
+]
+
+def apply_schema():
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        for statement in SCHEMA_STATEMENTS:
+            cursor.execute(statement)
+        conn.commit()
+        print(f"Applied {len(SCHEMA_STATEMENTS)} schema statements.")
+
+    except Exception as e:
+        conn.rollback()
+        print("Error applying schema:", e)
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    apply_schema()
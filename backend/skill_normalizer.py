@@ -0,0 +1,248 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from backend.resources import EMBEDDING_MODEL_NAME
+from backend.skills import SKILLS_LIST, skills_version
+
+# Maps free-text phrases from resumes/JDs onto the canonical skill vocabulary.
+# Known synonyms resolve through the seed aliases, then the learned aliases (in memory,
+# backed by the skill_aliases table so every process shares them); anything else is
+# embedded once per document and compared against precomputed skill vectors.
+
+SIMILARITY_THRESHOLD = float(os.getenv("SKILL_SIMILARITY_THRESHOLD", "0.88"))
+MAX_NGRAM = 3
+MAX_CANDIDATES = 2000 # per document, keeps one encode call bounded
+ALIAS_CACHE_SIZE = 100_000
+VECTOR_CACHE_DIR = os.path.join(".cache", "skill_vectors")
+ALIAS_DB_TIMEOUT_SECONDS = 1.0 # alias table is best-effort; never wait long for a connection
+
+# Seed aliases: abbreviations and spellings embeddings alone get wrong or borderline
+SKILL_ALIASES = {
+    "ml": "machine learning",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "postgres": "postgresql",
+    "psql": "postgresql",
+    "sklearn": "scikit-learn",
+    "scikit learn": "scikit-learn",
+    "k8s": "kubernetes",
+    "huggingface": "hugging face",
+    "powerbi": "power bi",
+    "mongo": "mongodb",
+    "elastic search": "elasticsearch",
+    "google cloud": "gcp",
+    "google cloud platform": "gcp",
+    "amazon web services": "aws",
+    "ms sql": "sql server",
+    "mssql": "sql server",
+    "w&b": "weights & biases",
+    "a/b tests": "a/b testing",
+    "apache spark": "spark",
+    "apache kafka": "kafka",
+    "apache airflow": "airflow",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#&./-]*")
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is",
+    "it", "of", "on", "or", "our", "the", "to", "we", "with", "you", "your", "will", "using",
+    "experience", "years", "year", "strong", "knowledge", "skills", "ability", "work", "team",
+}
+
+def candidate_phrases(text_lower: str, max_ngram: int = MAX_NGRAM) -> List[str]:
+    tokens = [t.strip("./-") for t in _TOKEN_RE.findall(text_lower)]
+    tokens = [t for t in tokens if t]
+
+    seen: Dict[str, None] = {}
+    for n in range(1, max_ngram + 1):
+        for i in range(len(tokens) - n + 1):
+            gram = tokens[i:i + n]
+            if gram[0] in _STOPWORDS or gram[-1] in _STOPWORDS:
+                continue
+            if n == 1 and (len(gram[0]) < 2 or gram[0].isdigit()):
+                continue
+            seen.setdefault(" ".join(gram), None)
+    return list(seen)
+
+class SkillNormalizer:
+
+    def __init__(
+        self,
+        skills: Sequence[str] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        model=None,
+        model_name: str = EMBEDDING_MODEL_NAME,
+        persist: bool = True,
+    ):
+        self.skills: Tuple[str, ...] = tuple(dict.fromkeys(SKILLS_LIST if skills is None else skills))
+        self.version = skills_version(self.skills)
+        self.threshold = threshold
+        self.model_name = model_name
+        self.persist = persist
+        self._model = model
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+        skill_set = set(self.skills)
+        self._seed_aliases: Dict[str, str] = {
+            phrase: skill for phrase, skill in SKILL_ALIASES.items() if skill in skill_set
+        }
+        self._seed_aliases.update({skill: skill for skill in self.skills})
+        # Learned phrase -> skill (or None when nothing was close enough), LRU-bounded
+        self._learned: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self.stats = {"alias_hits": 0, "stored_hits": 0, "embedded": 0, "resolved": 0}
+
+    @property
+    def model(self):
+        if self._model is None:
+            # Import locally: loading the embedding model is expensive
+            from backend.retrieval import get_embedding_model
+            self._model = get_embedding_model()
+        return self._model
+
+    def _encode(self, phrases: List[str]) -> np.ndarray:
+        return np.asarray(self.model.encode(phrases, normalize_embeddings=True, batch_size=64), dtype=np.float32)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        # (V, d) unit vectors for the vocabulary, computed once per (model, version) and kept on disk
+        if self._vectors is None:
+            model_key = re.sub(r"[^A-Za-z0-9.-]+", "_", self.model_name)
+            path = os.path.join(VECTOR_CACHE_DIR, f"{model_key}-{self.version}.npy")
+            if os.path.exists(path):
+                self._vectors = np.load(path)
+            else:
+                self._vectors = self._encode(list(self.skills))
+                os.makedirs(VECTOR_CACHE_DIR, exist_ok=True)
+                np.save(path, self._vectors)
+        return self._vectors
+
+    def _lookup(self, phrase: str) -> Tuple[bool, Optional[str]]:
+        if phrase in self._seed_aliases:
+            return True, self._seed_aliases[phrase]
+        if phrase in self._learned:
+            self._learned.move_to_end(phrase)
+            return True, self._learned[phrase]
+        return False, None
+
+    def _remember(self, phrase: str, skill: Optional[str]):
+        self._learned[phrase] = skill
+        if len(self._learned) > ALIAS_CACHE_SIZE:
+            self._learned.popitem(last=False)
+
+    def _load_stored(self, phrases: List[str]) -> Dict[str, Tuple[Optional[str], float]]:
+        # phrase -> (best skill, similarity) learned by any process; empty if the DB is unavailable
+        from backend.resources import get_registry
+
+        try:
+            conn = get_registry().get_connection(timeout=ALIAS_DB_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"Skill alias table unavailable: {e}")
+            return {}
+        cursor = conn.cursor()
+        try:
+            cursor.execute(
+                """
+                SELECT phrase, skill, similarity
+                FROM skill_aliases
+                WHERE skills_version = %s AND model_name = %s AND phrase = ANY(%s)
+                """,
+                (self.version, self.model_name, phrases),
+            )
+            return {phrase: (skill, similarity) for phrase, skill, similarity in cursor.fetchall()}
+        except Exception as e:
+            print(f"Error reading skill aliases: {e}")
+            return {}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _store(self, rows: List[Tuple[str, Optional[str], float]]):
+        from psycopg2.extras import execute_values
+        from backend.resources import get_registry
+
+        try:
+            conn = get_registry().get_connection(timeout=ALIAS_DB_TIMEOUT_SECONDS)
+        except Exception as e:
+            print(f"Skill alias table unavailable: {e}")
+            return
+        cursor = conn.cursor()
+        try:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO skill_aliases (skills_version, model_name, phrase, skill, similarity)
+                VALUES %s
+                ON CONFLICT (skills_version, model_name, phrase) DO NOTHING
+                """,
+                [(self.version, self.model_name, phrase, skill, similarity) for phrase, skill, similarity in rows],
+                page_size=1000,
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"Error storing skill aliases: {e}")
+        finally:
+            cursor.close()
+            conn.close()
+
+    def normalize(self, text_lower: str) -> List[str]:
+        phrases = candidate_phrases(text_lower)[:MAX_CANDIDATES]
+
+        found = set()
+        unknown = []
+        with self._lock:
+            for phrase in phrases:
+                known, skill = self._lookup(phrase)
+                if known:
+                    self.stats["alias_hits"] += 1
+                    if skill is not None:
+                        found.add(skill)
+                else:
+                    unknown.append(phrase)
+
+        if unknown and self.persist:
+            # Phrases another process already embedded; the threshold is applied on read
+            stored = self._load_stored(unknown)
+            with self._lock:
+                for phrase, (best_skill, score) in stored.items():
+                    skill = best_skill if best_skill in self.skills and score >= self.threshold else None
+                    self._remember(phrase, skill)
+                    self.stats["stored_hits"] += 1
+                    if skill is not None:
+                        found.add(skill)
+            unknown = [phrase for phrase in unknown if phrase not in stored]
+
+        if unknown:
+            # One batched encode + one matrix product for all new phrases of this document
+            similarities = self._encode(unknown) @ self.vectors.T
+            best = similarities.argmax(axis=1)
+            best_scores = similarities[np.arange(len(unknown)), best]
+            learned = []
+            with self._lock:
+                self.stats["embedded"] += len(unknown)
+                for phrase, idx, score in zip(unknown, best, best_scores):
+                    skill = self.skills[idx] if score >= self.threshold else None
+                    self._remember(phrase, skill) # negative results are cached too
+                    learned.append((phrase, self.skills[idx], float(score)))
+                    if skill is not None:
+                        self.stats["resolved"] += 1
+                        found.add(skill)
+            if self.persist:
+                self._store(learned)
+
+        return [skill for skill in self.skills if skill in found]
+
+@lru_cache(maxsize=4)
+def _build_normalizer(skills: Tuple[str, ...]) -> SkillNormalizer:
+    return SkillNormalizer(skills)
+
+def get_skill_normalizer(skills: Sequence[str] = None) -> SkillNormalizer:
+    return _build_normalizer(tuple(SKILLS_LIST if skills is None else skills))
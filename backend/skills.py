@@ -0,0 +1,155 @@
+import hashlib
+import os
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Sequence, Set, Tuple
+
+SKILLS_LIST = [
+    # Programming Languages
+    "python", "r", "sql", "java", "c++", "scala", "julia", "matlab", "sas",
+    
+    # Data Manipulation & Analysis
+    "pandas", "numpy", "scipy", "dask", "polars", "vaex", "modin", 
+    
+    # Visualization
+    "matplotlib", "seaborn", "plotly", "bokeh", "altair", "ggplot", "tableau", "power bi", "looker", "quicksight",
+    
+    # Machine Learning & Statistics
+    "scikit-learn", "xgboost", "lightgbm", "catboost", "statsmodels", "h2o", "auto-sklearn", "tpot",
+    "regression", "classification", "clustering", "time series", "forecasting", "a/b testing", "hypothesis testing",
+    "machine learning", "deep learning", "natural language processing", "computer vision",
+    
+    # Deep Learning (Frameworks & Architectures)
+    "pytorch", "tensorflow", "keras", "mxnet", "jax", "fastai", "opencv",
+    "cnn", "rnn", "lstm", "gan", "transformer", "bert", "gpt", "diffusion models",
+    
+    # NLP & LLM
+    "nltk", "spacy", "gensim", "textblob", "hugging face", "transformers", "langchain", "llamaindex", 
+    "haystack", "openai api", "anthropic", "gemini", "llama", "mistral", "rag", "retrieval augmented generation",
+    "prompt engineering", "fine-tuning", "lora", "qlora",
+    
+    # Vector Databases & Search
+    "vector database", "pgvector", "pinecone", "faiss", "weaviate", "chromadb", "milvus", "qdrant", "elasticsearch", "opensearch",
+    
+    # Big Data & Distributed Computing
+    "spark", "pyspark", "hadoop", "hive", "kafka", "flink", "databricks", "snowflake", "bigquery", "redshift",
+    
+    # MLOps & Model Serving
+    "mlflow", "kubeflow", "airflow", "prefect", "dbt", "wandb", "weights & biases", "bentoml", "ray", 
+    "sagemaker", "vertex ai", "azure ml", "docker", "kubernetes", "git", "ci/cd",
+    
+    # Databases (SQL & NoSQL)
+    "postgresql", "mysql", "mongodb", "cassandra", "redis", "dynamodb", "oracle", "sql server",
+    
+    # Cloud Platforms
+    "aws", "gcp", "azure", "ibm cloud", "oracle cloud"
+]
+
+def skills_version(skills: Sequence[str]) -> str:
+    # Short content hash; changes whenever the vocabulary (or its order) changes
+    return hashlib.sha1("\n".join(skills).encode("utf-8")).hexdigest()[:12]
+
+SKILLS_VERSION = skills_version(SKILLS_LIST)
+
+class SkillMatch(NamedTuple):
+    skill: str
+    start: int
+    end: int
+
+def _trie_pattern(words: Sequence[str]) -> str:
+    # Build a character trie and render it as one regex, so the engine
+    # walks each position once instead of retrying every skill.
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def render(node: Dict) -> str:
+        is_end = "" in node
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if is_end:
+            # Greedy optional: the longest skill at a position is tried first
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+class SkillMatcher:
+    r"""
+    Multi-pattern skill matcher with the same word-boundary semantics as
+    re.search(r'\b' + re.escape(skill) + r'\b', text) for every skill.
+    Expects lowercase text, like the skill vocabulary.
+    """
+
+    def __init__(self, skills: Sequence[str]):
+        self.skills: Tuple[str, ...] = tuple(dict.fromkeys(skills))
+        self.version = skills_version(self.skills)
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        # Lookahead keeps matches zero-width, so overlapping skills are not swallowed.
+        self._pattern = re.compile(r"(?=\b(" + _trie_pattern(self.skills) + r")\b)")
+
+        # Skills that are proper prefixes of another skill ("sql" / "sql server")
+        # can match at the same position as the longer one; check those explicitly.
+        self._single = {skill: re.compile(r"\b" + re.escape(skill) + r"\b") for skill in self.skills}
+        self._prefixes: Dict[str, List[str]] = {
+            skill: [other for other in self.skills if other != skill and skill.startswith(other)]
+            for skill in self.skills
+        }
+
+    def find(self, text: str) -> List[SkillMatch]:
+        matches = []
+        for m in self._pattern.finditer(text):
+            skill = m.group(1)
+            start = m.start(1)
+            matches.append(SkillMatch(skill, start, start + len(skill)))
+            for prefix in self._prefixes[skill]:
+                if self._single[prefix].match(text, start):
+                    matches.append(SkillMatch(prefix, start, start + len(prefix)))
+        return matches
+
+    def find_skills(self, text: str) -> List[str]:
+        # Distinct skills in vocabulary order (same order as the old per-skill loop)
+        found: Set[str] = {m.skill for m in self.find(text)}
+        return sorted(found, key=self._order.__getitem__)
+
+@lru_cache(maxsize=8)
+def _build_matcher(skills: Tuple[str, ...]) -> SkillMatcher:
+    return SkillMatcher(skills)
+
+def get_skill_matcher(skills: Sequence[str] = None) -> SkillMatcher:
+    # Built once per vocabulary version and reused for every resume/JD
+    return _build_matcher(tuple(SKILLS_LIST if skills is None else skills))
+
+# Map synonyms/abbreviations ("ML", "Postgres") onto the vocabulary via embeddings, see backend.skill_normalizer
+SEMANTIC_SKILL_MATCHING = os.getenv("SEMANTIC_SKILL_MATCHING", "").lower() in ("1", "true", "yes")
+
+# Identifies how cached resume entities were produced (vocabulary + matching mode)
+SKILL_EXTRACTION_VERSION = SKILLS_VERSION + ("+semantic" if SEMANTIC_SKILL_MATCHING else "")
+
+def extract_skills(text_lower: str, skills: Sequence[str] = None) -> List[str]:
+    found = get_skill_matcher(skills).find_skills(text_lower)
+    if not SEMANTIC_SKILL_MATCHING:
+        return found
+
+    # Import locally: the normalizer pulls in the embedding model
+    from backend.skill_normalizer import get_skill_normalizer
+    semantic = set(get_skill_normalizer(skills).normalize(text_lower))
+    vocab = get_skill_matcher(skills).skills
+    return [skill for skill in vocab if skill in semantic or skill in found]
+
+def extract_skills_from_text_list(text_list: Sequence[Any], skills: Sequence[str] = None) -> Set[str]:
+    # Standard skills mentioned anywhere in verbose JD requirement strings
+    combined_text = " ".join(str(x) for x in text_list).lower()
+    return set(extract_skills(combined_text, skills))
+
+def requirement_skills(jd_data: Dict[str, Any], skills: Sequence[str] = None) -> List[str]:
+    # Vocabulary skills a JD asks for (must-have or nice-to-have), in vocabulary order
+    found = extract_skills_from_text_list(jd_data.get("must_have", []), skills)
+    found |= extract_skills_from_text_list(jd_data.get("nice_to_have", []), skills)
+    return [skill for skill in get_skill_matcher(skills).skills if skill in found]
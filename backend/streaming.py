@@ -0,0 +1,70 @@
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from backend.ingestion import get_connection
+
+# Shared read helpers for analytics-sized results, built on COPY ... TO STDOUT (CSV):
+# rows never become per-row Python tuples.
+#   copy_query_to_csv: streams the CSV into a file-like object; used for exports.
+#   copy_query_dataframe / query_dataframe: spool the CSV (in memory, spilling to a temp
+#     file above COPY_SPOOL_BYTES) and parse it straight into typed DataFrame columns.
+
+COPY_SPOOL_BYTES = 64 * 1024 * 1024 # COPY output above this spills to a temp file
+# Explicit NULL marker for DataFrame reads: the CSV default (empty field) is indistinguishable
+# from an empty string once parsed, and pandas' default NA strings ("NA", "null", ...) are real data
+COPY_NULL_MARKER = r"\N"
+
+def _copy_sql(cursor, sql: str, params: Sequence[Any], null: Optional[str] = None) -> str:
+    query = cursor.mogrify(sql.strip().rstrip(";"), tuple(params)).decode()
+    null_sql = "" if null is None else ", NULL " + cursor.mogrify("%s", (null,)).decode()
+    return f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER true{null_sql})"
+
+def copy_query_to_csv(sql: str, params: Sequence[Any], out, null: Optional[str] = None) -> None:
+    # Streams the result as CSV into a binary or text file-like object; null overrides the
+    # NULL spelling (default: empty unquoted field)
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.copy_expert(_copy_sql(cursor, sql, params, null), out)
+    finally:
+        cursor.close()
+        conn.rollback()
+        conn.close()
+
+def copy_query_dataframe(
+    sql: str,
+    params: Sequence[Any] = (),
+    dtypes: Optional[Dict[str, Any]] = None,
+    parse_dates: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    # COPY CSV straight into typed columns (pyarrow engine when available).
+    # Only COPY_NULL_MARKER becomes NaN; every other string, empty included, is kept as is.
+    read_kwargs = {
+        "dtype": dtypes,
+        "parse_dates": parse_dates,
+        "keep_default_na": False,
+        "na_values": [COPY_NULL_MARKER],
+    }
+    with tempfile.SpooledTemporaryFile(max_size=COPY_SPOOL_BYTES, mode="w+b") as spool:
+        copy_query_to_csv(sql, params, spool, null=COPY_NULL_MARKER)
+        spool.seek(0)
+        try:
+            return pd.read_csv(spool, engine="pyarrow", **read_kwargs)
+        except ImportError:
+            spool.seek(0)
+            return pd.read_csv(spool, **read_kwargs)
+
+def query_dataframe(
+    sql: str,
+    params: Sequence[Any] = (),
+    columns: Sequence[str] = (),
+    parse_dates: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    # Full-frame read; columns renames the result positionally (SQL aliases may differ)
+    df = copy_query_dataframe(sql, params, parse_dates=parse_dates)
+    if columns:
+        df.columns = list(columns)
+    return df
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -24,3 +25,36 @@ Use the sidebar to:
 This is a thin Streamlit UI on top of the backend RAG system (PostgreSQL + pgvector, BGE embeddings, Gemini 3 Flash Preview).
 """
 )
+
+from backend.resources import get_registry
+
+# Model, DB pool and LLM clients live once per server process and are shared by all sessions
+registry = get_registry()
+if os.getenv("WARMUP_ON_START", "0") == "1" and registry.warmup_seconds is None:
+    with st.spinner("Loading embedding model, database pool and LLM clients..."):
+        registry.warmup()
+
+st.subheader("⚙️ System Resources")
+
+if st.button("Warm up resources", disabled=registry.warmup_seconds is not None):
+    with st.spinner("Loading embedding model, database pool and LLM clients..."):
+        registry.warmup()
+
+report = registry.report()
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Process memory (RSS)", f"{report['rss_bytes'] / 1024 ** 2:.0f} MB")
+with col2:
+    model_bytes = report["embedding_model_bytes"]
+    st.metric("Embedding model", f"{model_bytes / 1024 ** 2:.0f} MB" if model_bytes else "not loaded")
+with col3:
+    st.metric("DB connections in use", f"{report['pool_checked_out']} / {report['pool_max']}")
+with col4:
+    warmup_seconds = report["warmup_seconds"]
+    st.metric("Warmup time", f"{warmup_seconds:.1f}s" if warmup_seconds is not None else "not warmed up")
+
+with st.expander("Load times and latency"):
+    st.write("Loaded resources:", report["loaded"] or "none yet")
+    st.write({name: f"{seconds:.2f}s" for name, seconds in report["load_seconds"].items()})
+    if st.button("Measure latency"):
+        st.write({name: f"{ms:.1f} ms" for name, ms in registry.probe_latency().items()})
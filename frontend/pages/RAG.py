@@ -1,34 +1,17 @@
 import sys
 import os
 
-from typing import List, Tuple, Optional
+from typing import Optional
 
 import streamlit as st
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 
-from backend.ingestion import get_connection
+from backend.ingestion import search_documents
 from backend.rag_pipeline import answer_query
 
-
-def list_documents() -> List[Tuple[str, str]]:
-    
-    conn = get_connection()
-    cursor = conn.cursor()
-    try:
-        cursor.execute(
-            """
-            SELECT id, title
-            FROM documents
-            ORDER BY title;
-            """
-        )
-        rows = cursor.fetchall()
-        return [(str(r[0]), r[1]) for r in rows]
-    finally:
-        cursor.close()
-        conn.close()
+DOCUMENT_PICKER_LIMIT = 20
 
 # ----------------- Streamlit UI -----------------
 
@@ -41,16 +24,29 @@ st.markdown(
     "\n\nEmbedding Model: BAAI/bge-base-en-v1.5"
 )
 
-docs = list_documents()
+# Typeahead: only the best title matches are fetched (cached in the backend)
+col_search, col_type = st.columns([3, 1])
+with col_search:
+    doc_query = st.text_input("Find a document", placeholder="Start typing a resume title...")
+with col_type:
+    doc_type_label = st.selectbox("Type", ["Resumes", "Job descriptions", "All"])
+doc_type = {"Resumes": "resume", "Job descriptions": "job_description", "All": None}[doc_type_label]
+
+docs = search_documents(doc_query, doc_type=doc_type, limit=DOCUMENT_PICKER_LIMIT)
 
 options = ["🔍 All documents"]
 doc_id_map = {}  # label -> id
 
-for doc_id, title in docs:
+for doc_id, title, _ in docs:
     label = f"{title} ({doc_id[:8]})"
     options.append(label)
     doc_id_map[label] = doc_id
 
+if doc_query and not docs:
+    st.caption("No documents match that title.")
+elif len(docs) == DOCUMENT_PICKER_LIMIT:
+    st.caption(f"Showing the first {DOCUMENT_PICKER_LIMIT} matches; type more to narrow down.")
+
 selected_option = st.selectbox("Search within:", options)
 
 if selected_option == "🔍 All documents":
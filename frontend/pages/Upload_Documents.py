@@ -6,72 +6,84 @@ import streamlit as st
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from backend.ingestion import (
-    main as ingest_pdf,
-    read_pdf_text,
-    clean_text,
-    extract_sections,
-)
+from backend.ingestion import INGEST_WORKERS, ingest_pdfs_parallel
 
 st.title("📄 Upload & Ingest Document")
 
 st.markdown(
-    "Upload a **PDF resume** to ingest it into the RAG system. "
+    "Upload one or more **PDF resumes** to ingest them into the RAG system. "
     "The backend will extract sections, store them in PostgreSQL + pgvector, "
-    "and compute embeddings (once you run your embedding pipeline)."
+    "and compute embeddings. Files are ingested in parallel."
 )
 
-uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
-
-if uploaded_file is not None:
-    st.write(f"**File name:** `{uploaded_file.name}`")
-
-    if st.button("Ingest document"):
-        # 1. Save uploaded file to a temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(uploaded_file.getbuffer())
-            tmp_path = tmp.name
+uploaded_files = st.file_uploader("Upload PDF files", type=["pdf"], accept_multiple_files=True)
+
+if uploaded_files:
+    st.write(f"**{len(uploaded_files)} file(s) selected:** " + ", ".join(f"`{f.name}`" for f in uploaded_files))
+
+    if st.button("Ingest documents"):
+        # 1. Save uploaded files to temporary locations
+        files = []
+        for uploaded_file in uploaded_files:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                tmp.write(uploaded_file.getbuffer())
+                files.append((tmp.name, uploaded_file.name))
+
+        progress = st.progress(0.0, text=f"Ingesting 0/{len(files)} documents...")
+        # One status line per file, updated as each one finishes
+        status_lines = {}
+        for tmp_path, name in files:
+            status_lines[tmp_path] = st.empty()
+            status_lines[tmp_path].write(f"⏳ `{name}`")
+
+        def on_file_done(done, total, stats):
+            progress.progress(done / total, text=f"Ingested {done}/{total} documents...")
+            line = status_lines[stats["source_path"]]
+            if "error" in stats:
+                line.write(f"❌ `{stats['title']}`: {stats['error']}")
+            else:
+                line.write(
+                    f"✅ `{stats['title']}`: {stats['sections']} sections, "
+                    f"{stats['applications']} applications, {stats['timings']['total']:.1f}s"
+                )
 
         try:
-            with st.spinner("Ingesting document into database..."):
-                # 2. Run your existing ingestion pipeline
-                #    This will:
-                #      - insert into `documents`
-                #      - read & clean text
-                #      - extract sections
-                #      - insert into `resume_sections`
-                ingest_pdf(tmp_path, original_filename=uploaded_file.name)
-
-            # 3. Compute section & token counts for display
-            raw_text = read_pdf_text(tmp_path)
-            cleaned = clean_text(raw_text)
-            sections = extract_sections(cleaned)
-
-            section_count = len(sections)
-            # crude token count; you can swap in a tokenizer if you want
-            token_count = len(cleaned.split())
-
-            st.success("Ingestion completed successfully ✅")
-
-            # 4. Show metrics
-            col1, col2 = st.columns(2)
+            # 2. Run the ingestion pipeline for every file
+            #    (insert document + sections, embed, auto-apply and score);
+            #    each run returns its own section/token counts and stage timings
+            results = ingest_pdfs_parallel(files, max_workers=INGEST_WORKERS, progress_callback=on_file_done)
+
+            succeeded = [r for r in results if "error" not in r]
+            failed = len(results) - len(succeeded)
+            if failed:
+                st.warning(f"Ingested {len(succeeded)} of {len(results)} documents; {failed} failed.")
+            else:
+                st.success("Ingestion completed successfully ✅")
+
+            # 3. Show metrics
+            col1, col2, col3 = st.columns(3)
             with col1:
-                st.metric("Sections", section_count)
+                st.metric("Documents", len(succeeded))
             with col2:
-                st.metric("Approx. tokens", token_count)
+                st.metric("Sections", sum(r["sections"] for r in succeeded))
+            with col3:
+                st.metric("Approx. tokens", sum(r["tokens"] for r in succeeded))
 
-            # 5. Leave room for future detail
+            # 4. Per-file details
             with st.expander("View more details"):
-                st.write(
-                    "Section labels available:"
-                )
-                preview_labels = [s.get("label", "unknown") for s in sections[:5]]
-                st.write(preview_labels)
+                for r in succeeded:
+                    st.write(f"**{r['title']}** (document {r['document_id']})")
+                    st.write("Section labels:", r["section_labels"][:5])
+                    st.write(
+                        "Timings (s): "
+                        + ", ".join(f"{stage} {seconds:.2f}" for stage, seconds in r["timings"].items())
+                    )
 
         except Exception as e:
             st.error(f"Error during ingestion: {e}")
 
         finally:
-            # clean up temp file
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+            # clean up temp files
+            for tmp_path, _ in files:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
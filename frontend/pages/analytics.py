@@ -1,18 +1,21 @@
 import streamlit as st
-import pandas as pd
 from backend.ats import generate_ai_explanation
+from backend.explanations import DEFAULT_TOP_N, generate_explanations_for_job
 from backend.analytics import (
-    get_global_ats_stats,
-    get_applications_by_status,
-    get_department_stats,
-    get_job_level_stats,
-    get_applications_for_job,
+    get_dashboard_snapshot,
+    get_applications_page,
     get_role_stats,
-    get_role_score,
     get_missing_skills,
     get_missing_skills_for_job,
-    get_application_details
+    get_application_details,
+    get_score_histogram,
+    get_score_quantiles,
+    get_stage_conversion,
+    get_status_funnel,
 )
+from backend.roles import get_role_families
+
+APPLICATIONS_PAGE_SIZE = 50
 
 
 def main():
@@ -21,7 +24,9 @@ def main():
     # ===== GLOBAL STATS =====
     st.header("Overview")
 
-    stats = get_global_ats_stats()
+    # One cached round trip for every overview dataset
+    snapshot = get_dashboard_snapshot()
+    stats = snapshot["stats"]
 
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -39,7 +44,7 @@ def main():
     # ===== APPLICATIONS BY STATUS =====
     st.subheader("Applications by Status")
 
-    df_status = get_applications_by_status()
+    df_status = snapshot["by_status"]
     if df_status.empty:
         st.info("No applications yet.")
     else:
@@ -49,12 +54,27 @@ def main():
             horizontal=True
         )
 
+    # ===== HIRING FUNNEL =====
+    st.subheader("Hiring Funnel")
+
+    df_stages = get_stage_conversion()
+    if df_stages.empty:
+        st.info("No status history yet.")
+    else:
+        col_stages, col_transitions = st.columns(2)
+        with col_stages:
+            st.caption("Applications entering each stage")
+            st.dataframe(df_stages, width='stretch')
+        with col_transitions:
+            st.caption("Transitions and time spent in the previous stage")
+            st.dataframe(get_status_funnel(), width='stretch')
+
     st.write("---")
 
     # ===== DEPARTMENT STATS =====
     st.subheader("Per-Department Stats")
 
-    df_dept = get_department_stats()
+    df_dept = snapshot["departments"]
     if df_dept.empty:
         st.info("No job posts found.")
     else:
@@ -67,10 +87,46 @@ def main():
 
     st.write("---")
 
+    # ===== ROLE FAMILY STATS =====
+    st.subheader("Per-Role Stats")
+
+    families = get_role_families()
+    if not families:
+        st.info("No role families yet.")
+    else:
+        family_labels = {f["id"]: f"{f['name']} ({f['job_count']} jobs)" for f in families}
+        selected_family_id = st.selectbox(
+            "Select a role family",
+            list(family_labels),
+            format_func=family_labels.get,
+        )
+
+        role_stats = get_role_stats(role_family_id=selected_family_id)
+        r1, r2, r3, r4 = st.columns(4)
+        with r1:
+            st.metric("Scored Applications", role_stats["total_applications"])
+        with r2:
+            st.metric("Avg Score", f"{role_stats['avg_score']:.1f}" if role_stats["avg_score"] is not None else "N/A")
+        with r3:
+            st.metric("Median Score", f"{role_stats['median_score']:.0f}" if role_stats["median_score"] is not None else "N/A")
+        with r4:
+            st.metric("Best Score", f"{role_stats['max_score']:.0f}" if role_stats["max_score"] is not None else "N/A")
+
+        if role_stats["total_applications"]:
+            col_dist, col_gaps = st.columns(2)
+            with col_dist:
+                st.caption("ATS Score Distribution")
+                st.bar_chart(get_score_histogram(role_family_id=selected_family_id).set_index("bin")["count"])
+            with col_gaps:
+                st.caption("Most common missing must-have skills")
+                st.dataframe(get_missing_skills(role_family_id=selected_family_id, limit=10), width='stretch')
+
+    st.write("---")
+
     # ===== PER-JOB STATS + DETAIL VIEW =====
     st.subheader("Per-Job Stats")
 
-    df_jobs = get_job_level_stats()
+    df_jobs = snapshot["job_level"]
     if df_jobs.empty:
         st.info("No job posts yet.")
         return
@@ -89,47 +145,91 @@ def main():
     if selected_job_id:
         st.markdown("### Applications for selected job")
 
-        df_apps = get_applications_for_job(selected_job_id)
+        # Filters run server-side; pages are fetched one at a time by keyset cursor
+        col_score, col_status = st.columns(2)
+        with col_score:
+            score_range = st.slider("ATS score range", 0, 100, (0, 100))
+        with col_status:
+            status_filter = st.multiselect("Status", snapshot["by_status"]["status"].tolist())
+
+        # Cursor stack per (job, filters): entry i is the cursor that starts page i
+        page_key = (selected_job_id, score_range, tuple(status_filter))
+        if st.session_state.get("apps_page_key") != page_key:
+            st.session_state["apps_page_key"] = page_key
+            st.session_state["apps_cursors"] = [None]
+        cursors = st.session_state["apps_cursors"]
+
+        df_apps, next_cursor = get_applications_page(
+            selected_job_id,
+            page_size=APPLICATIONS_PAGE_SIZE,
+            after=cursors[-1],
+            min_score=score_range[0] if score_range[0] > 0 else None,
+            max_score=score_range[1] if score_range[1] < 100 else None,
+            statuses=status_filter or None,
+        )
 
         if df_apps.empty:
             st.info("No applications for this job yet.")
         else:
-            available_cols = df_apps.columns.tolist()
             display_cols = ["application_id", "resume_name", "status", "ats_score", "created_at"]
-            final_cols = [c for c in display_cols if c in available_cols]
-            
-            # Sort by ATS Score descending
-            if "ats_score" in df_apps.columns:
-                df_apps = df_apps.sort_values(by="ats_score", ascending=False)
-
-            st.dataframe(df_apps[final_cols], width='stretch')
+            st.dataframe(df_apps[display_cols], width='stretch')
+
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("← Previous", disabled=len(cursors) == 1):
+                    cursors.pop()
+                    st.rerun()
+            with col_page:
+                st.caption(f"Page {len(cursors)} · {len(df_apps)} candidates")
+            with col_next:
+                if st.button("Next →", disabled=next_cursor is None):
+                    cursors.append(next_cursor)
+                    st.rerun()
+
+            # Precompute explanations so candidate views below load instantly
+            col_n, col_btn = st.columns([1, 2])
+            with col_n:
+                top_n = st.number_input("Top candidates", min_value=1, max_value=200, value=DEFAULT_TOP_N, step=1)
+            with col_btn:
+                st.write("")
+                if st.button("Generate AI explanations for top candidates"):
+                    progress = st.progress(0.0, text="Generating explanations...")
+                    report = generate_explanations_for_job(
+                        selected_job_id,
+                        top_n=int(top_n),
+                        progress_callback=lambda done, total: progress.progress(done / total, text=f"{done}/{total} explanations"),
+                    )
+                    if report["pending"] == 0:
+                        st.info("Top candidates already have explanations.")
+                    else:
+                        st.success(f"Generated {report['written']} explanations ({report['failed']} failed).")
 
-            # small score distribution chart
-            # Score Distribution Histogram
-            if "ats_score" in df_apps.columns and df_apps["ats_score"].notnull().any():
+            # Score distribution, binned and summarized in SQL
+            dist_data = get_score_histogram(job_post_id=selected_job_id).set_index("bin")["count"]
+            if dist_data.sum() > 0:
                 st.caption("ATS Score Distribution")
-                
-                # Create bins for better visualization
-                bins = [0, 10, 20, 30, 40, 50, 60, 70, 80, 90, 101]
-                labels = ['0-10', '11-20', '21-30', '31-40', '41-50', '51-60', '61-70', '71-80', '81-90', '91-100']
-                
-                valid_scores = df_apps.dropna(subset=["ats_score"])["ats_score"].astype(float)
-                
-                score_cats = pd.cut(valid_scores, bins=bins, labels=labels, right=False)
-                dist_data = score_cats.value_counts().sort_index()
-                
                 st.bar_chart(dist_data)
 
+                quantiles = get_score_quantiles(job_post_id=selected_job_id)
+                q_cols = st.columns(len(quantiles))
+                for col, (q, value) in zip(q_cols, quantiles.items()):
+                    with col:
+                        st.metric(f"P{int(q * 100)}", f"{value:.0f}" if value is not None else "N/A")
+
             # Candidate Gap Analysis Section
             st.markdown("### Candidate Analysis")
             st.caption("Select a candidate to view their assessment summary and detailed gap analysis.")
 
-            candidate_options = df_apps[["application_id", "resume_name", "ats_score"]].to_dict('records')
-            
+            # Picker over the current page only, labels looked up by id
+            candidate_labels = {
+                row.application_id: f"{row.resume_name} (Score: {row.ats_score})"
+                for row in df_apps.itertuples(index=False)
+            }
+
             selected_app_id = st.selectbox(
                 "Select Candidate",
-                options=[c["application_id"] for c in candidate_options],
-                format_func=lambda x: next((f"{c['resume_name']} (Score: {c['ats_score']})" for c in candidate_options if c["application_id"] == x), x)
+                options=list(candidate_labels),
+                format_func=lambda x: candidate_labels.get(x, x)
             )
 
             if selected_app_id:
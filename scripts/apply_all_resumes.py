@@ -5,30 +5,16 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.ingestion import get_connection
+from backend.ats_batch import score_application_ids
 
-def apply_all():
+def apply_all(score=True):
     conn = get_connection()
     cursor = conn.cursor()
     
-    print("Fetching all job posts and resumes...")
+    print("Applying all resumes to all job posts...")
     
+    new_app_ids = []
     try:
-        # Get all Job IDs
-        cursor.execute("SELECT id FROM job_posts")
-        job_ids = [row[0] for row in cursor.fetchall()]
-        
-        # Get all Resume Document IDs
- 
-        # Wait, documents table structure? Let's assume all documents in 'documents' table might be resumes if we filter or just all?
-        # Based on previous code: "FROM documents d" and user context.
-        # Let's verify if there is a category column? inspect_db didn't show documents table.
-        # Safe bet: Just grab all documents. Or check if there is a specific way to identify resumes.
-        # In `backend/ats.py`: `JOIN documents d ON a.resume_document_id = d.id`.
-        # I'll just grab all documents for now.
-        # Get all Resume Document IDs
-        cursor.execute("SELECT id FROM documents WHERE doc_type = 'resume'")
-        resume_ids = [row[0] for row in cursor.fetchall()]
-
         # Cleanup: Remove applications linked to non-resumes (from previous run)
         print("Cleaning up invalid applications (linked to non-resumes)...")
         cursor.execute("""
@@ -39,48 +25,41 @@ def apply_all():
         """)
         print(f"Deleted {cursor.rowcount} invalid applications.")
         
-        print(f"Found {len(job_ids)} jobs and {len(resume_ids)} resumes.")
-        
-        created_count = 0
-        
-        for job_id in job_ids:
-            for resume_id in resume_ids:
-                # Check if exists
-                cursor.execute(
-                    "SELECT 1 FROM applications WHERE job_post_id = %s AND resume_document_id = %s",
-                    (job_id, resume_id)
-                )
-                if cursor.fetchone():
-                    continue 
-                
-                # Create Application
-                # Note: We need a unique ID for application? `id` is UUID usually auto-generated if default? 
-                # Let's inspect if `id` has default gen_random_uuid(). usually yes.
-                # If not, I need to generate it.
-                # Let's assume database handles ID generation (SERIAL or DEFAULT gen_random_uuid()).
-                # If it's UUID, often explicit generation in code is safer if DB doesn't have default.
-                # Inspecting `backend/ingestion.py` or similar might reveal.
-                # But standard practice: Try insert without ID.
-                
-                cursor.execute(
-                    """
-                    INSERT INTO applications (job_post_id, resume_document_id, status, created_at, updated_at)
-                    VALUES (%s, %s, 'new', NOW(), NOW())
-                    ON CONFLICT DO NOTHING; 
-                    """,
-                    (job_id, resume_id)
-                )
-                created_count += 1
+        # Create every missing (job, resume) application in one statement;
+        # the unique constraint on (job_post_id, resume_document_id) skips existing pairs
+        cursor.execute(
+            """
+            INSERT INTO applications (job_post_id, resume_document_id, status, created_at, updated_at)
+            SELECT jp.id, d.id, 'new', NOW(), NOW()
+            FROM job_posts jp
+            CROSS JOIN documents d
+            WHERE d.doc_type = 'resume'
+            ON CONFLICT (job_post_id, resume_document_id) DO NOTHING
+            RETURNING id;
+            """
+        )
+        new_app_ids = [row[0] for row in cursor.fetchall()]
         
         conn.commit()
-        print(f"Successfully created {created_count} new applications.")
+        print(f"Successfully created {len(new_app_ids)} new applications.")
         
     except Exception as e:
         conn.rollback()
         print(f"Error applying resumes: {e}")
+        return []
     finally:
         cursor.close()
         conn.close()
 
+    if score and new_app_ids:
+        score_application_ids(new_app_ids)
+
+    return new_app_ids
+
 if __name__ == "__main__":
-    apply_all()
+    import argparse
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--no-score", action="store_true", help="Only create applications, leave scoring to run_ats_scoring.py")
+    args = parser.parse_args()
+    
+    apply_all(score=not args.no_score)
@@ -0,0 +1,10 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.ats_batch import backfill_application_skills
+
+if __name__ == "__main__":
+    count = backfill_application_skills()
+    print(f"Backfilled skill rows for {count} applications.")
@@ -0,0 +1,10 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.create_job_post import backfill_jd_requirements
+
+if __name__ == "__main__":
+    count = backfill_jd_requirements()
+    print(f"Backfilled requirements for {count} job posts.")
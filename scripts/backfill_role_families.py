@@ -0,0 +1,9 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.roles import backfill_role_families
+
+if __name__ == "__main__":
+    backfill_role_families()
@@ -0,0 +1,64 @@
+import sys
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.fake_llm import start_fake_server
+
+def run_benchmark(requests_count=200, concurrency=8, hedge=False, latency_median_ms=200.0, latency_sigma=0.6, error_rate=0.0, seed=42):
+    server = start_fake_server(
+        latency_median_ms=latency_median_ms,
+        latency_sigma=latency_sigma,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    # backend.llm reads its config at import time
+    os.environ["LLM_BACKEND"] = "fake"
+    os.environ["FAKE_LLM_BASE_URL"] = server.base_url
+    from backend import llm
+
+    def one_call(i):
+        start = time.perf_counter()
+        llm.generate_answer("You are a benchmark.", f"Request number {i}", max_new_tokens=64, hedge=hedge)
+        return time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = sorted(pool.map(one_call, range(requests_count)))
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    print(f"Requests: {requests_count}  concurrency: {concurrency}  hedge: {hedge}")
+    print(f"Throughput: {requests_count / elapsed:.1f} req/s")
+    print(f"Latency p50={pct(0.50)*1000:.1f}ms p95={pct(0.95)*1000:.1f}ms p99={pct(0.99)*1000:.1f}ms")
+    if hedge:
+        print("Hedge stats:", llm.get_hedge_stats())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--hedge", action="store_true")
+    parser.add_argument("--latency-median-ms", type=float, default=200.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.6)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    run_benchmark(
+        requests_count=args.requests,
+        concurrency=args.concurrency,
+        hedge=args.hedge,
+        latency_median_ms=args.latency_median_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
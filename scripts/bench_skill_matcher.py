@@ -0,0 +1,75 @@
+import sys
+import os
+import re
+import time
+import random
+import argparse
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.skills import SKILLS_LIST, get_skill_matcher
+
+FILLER_WORDS = [
+    "experience", "team", "developed", "built", "pipeline", "data", "models", "production",
+    "led", "project", "analysis", "customers", "improved", "latency", "using", "and", "with",
+    "years", "platform", "stakeholders", "reporting", "automated", "designed", "the", "for",
+]
+
+def legacy_find_skills(text_lower):
+    # The per-skill loop this module replaced
+    found = []
+    for skill in SKILLS_LIST:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            found.append(skill)
+    return found
+
+def make_resumes(count, words_per_resume, seed):
+    rng = random.Random(seed)
+    resumes = []
+    for _ in range(count):
+        words = []
+        for _ in range(words_per_resume):
+            if rng.random() < 0.08:
+                words.append(rng.choice(SKILLS_LIST))
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+            if rng.random() < 0.1:
+                words[-1] += rng.choice([",", ".", ";", "\n"])
+        resumes.append(" ".join(words).lower())
+    return resumes
+
+def run_benchmark(count=5000, words_per_resume=600, seed=7):
+    resumes = make_resumes(count, words_per_resume, seed)
+    print(f"Generated {count} resumes (~{words_per_resume} words each), {len(SKILLS_LIST)} skills.")
+
+    start = time.perf_counter()
+    matcher = get_skill_matcher()
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = [legacy_find_skills(text) for text in resumes]
+    legacy_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    compiled = [matcher.find_skills(text) for text in resumes]
+    compiled_seconds = time.perf_counter() - start
+
+    mismatches = sum(1 for a, b in zip(legacy, compiled) if a != b)
+
+    print(f"Matcher build:        {build_seconds * 1000:.1f} ms (version {matcher.version})")
+    print(f"Per-skill regex loop: {legacy_seconds:.2f} s ({legacy_seconds / count * 1000:.3f} ms/resume)")
+    print(f"Compiled matcher:     {compiled_seconds:.2f} s ({compiled_seconds / count * 1000:.3f} ms/resume)")
+    print(f"Speedup:              {legacy_seconds / compiled_seconds:.1f}x")
+    print(f"Mismatched resumes:   {mismatches}")
+    return mismatches
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=5000)
+    parser.add_argument("--words", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    mismatches = run_benchmark(args.resumes, args.words, args.seed)
+    sys.exit(1 if mismatches else 0)
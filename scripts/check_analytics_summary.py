@@ -0,0 +1,20 @@
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.analytics import check_application_summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare application_summary with live aggregates over applications.")
+    parser.add_argument("--repair", action="store_true", help="Rebuild the summary table if it has drifted")
+    args = parser.parse_args()
+
+    mismatches = check_application_summary(repair=args.repair)
+    if mismatches.empty:
+        print("application_summary is consistent.")
+    else:
+        print(mismatches.to_string(index=False))
+        print(f"{len(mismatches)} mismatching (job, status) keys." + (" Rebuilt." if args.repair else ""))
+        sys.exit(0 if args.repair else 1)
@@ -0,0 +1,10 @@
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.ats_batch import compact_score_breakdowns
+
+if __name__ == "__main__":
+    count = compact_score_breakdowns()
+    print(f"Compacted {count} score breakdowns. Run VACUUM applications to reclaim the space.")
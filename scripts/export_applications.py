@@ -0,0 +1,20 @@
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.analytics import export_applications_csv
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export scored applications with their ATS scores as CSV (streamed with COPY).")
+    parser.add_argument("output", help="CSV file to write, '-' for stdout")
+    parser.add_argument("--job", help="Only export scored applications of this job post id")
+    args = parser.parse_args()
+
+    if args.output == "-":
+        export_applications_csv(sys.stdout.buffer, job_post_id=args.job)
+    else:
+        with open(args.output, "wb") as f:
+            export_applications_csv(f, job_post_id=args.job)
+        print(f"Exported scored applications to {args.output}")
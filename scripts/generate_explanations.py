@@ -0,0 +1,28 @@
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.explanations import (
+    DEFAULT_TOP_N,
+    EXPLANATION_CONCURRENCY,
+    EXPLANATION_RATE_PER_SECOND,
+    generate_explanations_for_all_jobs,
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate AI explanations for the top-N candidates of each job.")
+    parser.add_argument("--job", action="append", dest="jobs", help="Job post id (repeatable, default: all jobs)")
+    parser.add_argument("--top-n", type=int, default=DEFAULT_TOP_N)
+    parser.add_argument("--concurrency", type=int, default=EXPLANATION_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=EXPLANATION_RATE_PER_SECOND, help="LLM requests per second")
+    args = parser.parse_args()
+
+    totals = generate_explanations_for_all_jobs(
+        top_n=args.top_n,
+        job_ids=args.jobs,
+        concurrency=args.concurrency,
+        rate_per_second=args.rate,
+    )
+    print(f"Wrote {totals['written']}/{totals['pending']} explanations ({totals['failed']} failed).")
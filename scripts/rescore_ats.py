@@ -0,0 +1,20 @@
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.ats_batch import DEFAULT_CHUNK_SIZE
+from backend.rescoring import rescore_stale
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Rescore applications whose skill vocabulary, scoring formula or JD requirements changed."
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Only report how many applications are stale")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    report = rescore_stale(dry_run=args.dry_run, chunk_size=args.chunk_size)
+    if not args.dry_run:
+        print(f"Rescored {report['rescored']} applications.")
@@ -6,7 +6,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.ingestion import get_connection
 from backend.ats import evaluate_application
+from backend.ats_batch import (
+    score_pending_bulk,
+    run_scoring_worker,
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_CHECKPOINT_PATH,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_WORKER_BATCH_SIZE,
+)
 import time
+import multiprocessing
 
 def run_scoring(batch_size=None):
     conn = get_connection()
@@ -50,11 +59,60 @@ def run_scoring(batch_size=None):
         cursor.close()
         conn.close()
 
+def _worker_process(batch_size, lease_seconds, reports):
+    reports.put(run_scoring_worker(batch_size=batch_size, lease_seconds=lease_seconds))
+
+def run_workers(num_workers, batch_size=DEFAULT_WORKER_BATCH_SIZE, lease_seconds=DEFAULT_LEASE_SECONDS):
+    # Each process claims its own batches with SKIP LOCKED; more hosts can run the same command
+    reports = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=_worker_process, args=(batch_size, lease_seconds, reports))
+        for _ in range(num_workers)
+    ]
+    for p in processes:
+        p.start()
+
+    results = []
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        # Workers got the same SIGINT and finish their current batch
+        for p in processes:
+            p.join()
+
+    while not reports.empty():
+        results.append(reports.get())
+
+    total = sum(r["scored"] for r in results)
+    print("\nPer-worker throughput:")
+    for r in sorted(results, key=lambda r: r["worker_id"]):
+        print(f"  {r['worker_id']}: {r['scored']} apps in {r['elapsed_seconds']:.1f}s ({r['apps_per_second']:.1f} apps/s)")
+    print(f"Total scored: {total}")
+    return results
+
 if __name__ == "__main__":
     # Optional: pass limit arg
     import argparse
     parser = argparse.ArgumentParser()
     parser.add_argument("--limit", type=int, help="Limit number of apps to score", default=None)
+    parser.add_argument("--bulk", action="store_true", help="Score in memory and write back in batched UPDATEs")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Applications per bulk chunk")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT_PATH, help="Checkpoint file for bulk mode")
+    parser.add_argument("--resume", action="store_true", help="Continue a bulk run from its checkpoint")
+    parser.add_argument("--workers", type=int, default=0, help="Run N claim-based worker processes")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_WORKER_BATCH_SIZE, help="Applications claimed per worker batch")
+    parser.add_argument("--lease-seconds", type=int, default=DEFAULT_LEASE_SECONDS, help="Age after which a claim may be taken over")
     args = parser.parse_args()
     
-    run_scoring(args.limit)
+    if args.workers:
+        run_workers(args.workers, batch_size=args.batch_size, lease_seconds=args.lease_seconds)
+    elif args.bulk:
+        score_pending_bulk(
+            chunk_size=args.chunk_size,
+            limit=args.limit,
+            checkpoint_path=args.checkpoint,
+            resume=args.resume,
+        )
+    else:
+        run_scoring(args.limit)
@@ -0,0 +1,51 @@
+import random
+
+from backend.ats import calculate_ats_score
+from backend.ats_batch import BatchScorer
+from backend.skills import SKILLS_LIST
+
+# BatchScorer must reproduce calculate_ats_score for every (resume, job) pair
+
+def _random_case(rng):
+    resume = {"skills": rng.sample(SKILLS_LIST, rng.randint(0, 25)) + ["not a vocabulary skill"]}
+    jd = {
+        "must_have": [f"Experience with {skill}" for skill in rng.sample(SKILLS_LIST, rng.randint(0, 6))],
+        "nice_to_have": [f"{skill} is a plus" for skill in rng.sample(SKILLS_LIST, rng.randint(0, 4))],
+    }
+    return resume, jd
+
+def test_score_matrix_matches_per_pair_scoring():
+    rng = random.Random(1)
+    resumes, jds = zip(*[_random_case(rng) for _ in range(40)])
+
+    scorer = BatchScorer()
+    resume_matrix = scorer.encode_resumes(resumes)
+    must, nice = scorer.encode_jds(jds)
+    scores = scorer.score_matrix(resume_matrix, must, nice)
+
+    for r, resume in enumerate(resumes):
+        for j, jd in enumerate(jds):
+            assert scores[r, j] == calculate_ats_score(resume, jd)["score"]
+
+def test_score_pairs_and_decode_match_per_pair_scoring():
+    rng = random.Random(2)
+    resumes, jds = zip(*[_random_case(rng) for _ in range(30)])
+
+    scorer = BatchScorer()
+    resume_matrix = scorer.encode_resumes(resumes)
+    must, nice = scorer.encode_jds(jds)
+    pairs = [(rng.randrange(len(resumes)), rng.randrange(len(jds))) for _ in range(100)]
+    scores = scorer.score_pairs(resume_matrix, must, nice, [p[0] for p in pairs], [p[1] for p in pairs])
+
+    for (r, j), score in zip(pairs, scores):
+        expected = calculate_ats_score(resumes[r], jds[j])
+        decoded = scorer.decode(resume_matrix[r], must[j], nice[j], score)
+        assert decoded["score"] == expected["score"]
+        for key in ("matched_must", "missing_must", "matched_nice", "missing_nice"):
+            assert set(decoded[key]) == set(expected[key]), key
+
+def test_empty_requirements_score_zero():
+    scorer = BatchScorer()
+    resumes = scorer.encode_resumes([{"skills": ["python"]}])
+    must, nice = scorer.encode_jds([{"must_have": [], "nice_to_have": []}])
+    assert scorer.score_matrix(resumes, must, nice)[0, 0] == 0 == calculate_ats_score({"skills": ["python"]}, {})["score"]
@@ -0,0 +1,57 @@
+import itertools
+
+import pytest
+
+from backend import llm_cache
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_cache, "CACHE_MAX_BYTES", 100)
+    monkeypatch.setattr(llm_cache, "_conn", None)
+    monkeypatch.setattr(llm_cache, "_stats", {"hits": 0, "misses": 0, "writes": 0, "evictions": 0})
+    # Strictly increasing clock so last-used order is unambiguous
+    clock = itertools.count(1000)
+    monkeypatch.setattr(llm_cache.time, "time", lambda: float(next(clock)))
+    yield llm_cache
+    if llm_cache._conn is not None:
+        llm_cache._conn.close()
+
+def test_get_returns_what_was_put(cache):
+    key = cache.make_cache_key("model", [{"role": "user", "content": "hi"}], {"max_tokens": 10})
+    assert cache.get_cached(key) is None
+    cache.put_cached(key, "model", "hello")
+    assert cache.get_cached(key) == "hello"
+    assert cache.get_cache_stats()["hits"] == 1
+
+def test_cache_key_depends_on_model_and_params():
+    messages = [{"role": "user", "content": "hi"}]
+    key = llm_cache.make_cache_key("a", messages, {"max_tokens": 10})
+    assert key == llm_cache.make_cache_key("a", messages, {"max_tokens": 10})
+    assert key != llm_cache.make_cache_key("b", messages, {"max_tokens": 10})
+    assert key != llm_cache.make_cache_key("a", messages, {"max_tokens": 11})
+
+def test_evicts_least_recently_used_down_to_90_percent(cache):
+    for key in ("a", "b", "c", "d"):
+        cache.put_cached(key, "model", "x" * 25) # 100 bytes total: still within budget
+    assert cache.get_cache_stats()["evictions"] == 0
+
+    cache.get_cached("a") # "a" becomes most recently used, "b" the oldest
+    cache.put_cached("e", "model", "x" * 25) # 125 bytes -> evict to <= 90
+
+    assert cache.get_cached("b") is None
+    assert cache.get_cached("c") is None
+    for key in ("a", "d", "e"):
+        assert cache.get_cached(key) is not None
+    stats = cache.get_cache_stats()
+    assert stats["evictions"] == 2
+    assert stats["size_bytes"] == 75
+
+def test_size_total_tracks_replace_and_clear(cache):
+    cache.put_cached("a", "model", "x" * 30)
+    cache.put_cached("a", "model", "x" * 10) # replacing an entry swaps its size, not adds
+    cache.put_cached("b", "model", "x" * 20)
+    assert cache.get_cache_stats()["size_bytes"] == 30
+    cache.clear_cache()
+    assert cache.get_cache_stats()["size_bytes"] == 0
+    assert cache.get_cache_stats()["entries"] == 0
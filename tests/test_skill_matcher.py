@@ -0,0 +1,41 @@
+import random
+import re
+
+from backend.skills import SKILLS_LIST, SkillMatcher, get_skill_matcher
+
+# SkillMatcher must return exactly what the old per-skill regex loop did
+
+def legacy_find_skills(text, skills=SKILLS_LIST):
+    return [skill for skill in skills if re.search(r"\b" + re.escape(skill) + r"\b", text)]
+
+FIXED_TEXTS = [
+    "",
+    "python, sql and sql server on aws; c++ and r",
+    "a/b testing with scikit-learn and auto-sklearn",
+    "transformers and transformer models, bert, gpt-4, llama",
+    "machine learning, deep learning and natural language processing (nlp)",
+    "power bi dashboards; powerbi; tableau/looker",
+    "pythonic sqlalchemy rust-lang",
+    "retrieval augmented generation (rag) with langchain & llamaindex",
+]
+
+def test_matches_legacy_loop_on_fixed_texts():
+    matcher = get_skill_matcher()
+    for text in FIXED_TEXTS:
+        assert matcher.find_skills(text) == legacy_find_skills(text), text
+
+def test_matches_legacy_loop_on_random_skill_mixes():
+    rng = random.Random(0)
+    matcher = get_skill_matcher()
+    separators = [" ", ", ", "/", "-", " and ", ".", "(", ") ", "_", ""]
+    for _ in range(500):
+        words = rng.sample(SKILLS_LIST, rng.randint(1, 8)) + rng.sample(["experience", "x", "9", "pro"], 2)
+        rng.shuffle(words)
+        text = "".join(word + rng.choice(separators) for word in words)
+        assert matcher.find_skills(text) == legacy_find_skills(text), text
+
+def test_overlapping_and_prefix_skills():
+    skills = ["sql", "sql server", "server", "c", "c++"]
+    matcher = SkillMatcher(skills)
+    text = "ms sql server and c++ plus c"
+    assert matcher.find_skills(text) == legacy_find_skills(text, skills)